@@ -1,9 +1,8 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import io
 from typing import List, Optional, Dict, Tuple
+import hashlib
 import numpy as np
 import re
 import json
@@ -13,53 +12,67 @@ from datetime import datetime
 # ================================
 # DATA PERSISTENCE FUNCTIONS
 # ================================
-def save_data_to_file(data: pd.DataFrame, filename: str = "cached_data.json"):
-    """Save DataFrame to JSON file"""
+def save_data_to_file(data: pd.DataFrame, filename: str = "cached_data.parquet"):
+    """Save DataFrame to Parquet file"""
     try:
         if not data.empty:
-            # Convert DataFrame to JSON
-            data_dict = {
-                'data': data.to_dict('records'),
-                'timestamp': datetime.now().isoformat(),
-                'columns': list(data.columns)
-            }
-            
             # Create data directory if it doesn't exist
             os.makedirs('data', exist_ok=True)
-            
-            # Save to file
+
+            # Parquet keeps columnar dtypes, so dates round-trip without
+            # re-parsing and the file is a fraction of the JSON size
             filepath = os.path.join('data', filename)
-            with open(filepath, 'w') as f:
-                json.dump(data_dict, f, default=str)
-            
+            data.to_parquet(
+                filepath,
+                engine='pyarrow',
+                compression='zstd',
+                compression_level=3,
+                index=False
+            )
+
             return True
     except Exception as e:
         st.error(f"Error saving data: {e}")
         return False
 
-def load_data_from_file(filename: str = "cached_data.json") -> pd.DataFrame:
-    """Load DataFrame from JSON file"""
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_data_cached(filepath: str, mtime: float) -> pd.DataFrame:
+    """Parse a saved data file; memoized on path + modification time"""
+    if filepath.endswith('.parquet'):
+        # Dtypes round-trip losslessly, so no datetime re-parsing is needed
+        df = pd.read_parquet(filepath, engine='pyarrow')
+    else:
+        # Legacy JSON saves from older versions of the app
+        with open(filepath, 'r') as f:
+            data_dict = json.load(f)
+
+        df = pd.DataFrame(data_dict['data'])
+
+        # Convert date columns back to datetime if they exist
+        if 'date' in df.columns:
+            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+
+    # Remove duplicates keeping highest engine hours
+    df = remove_duplicates_keep_highest(df)
+
+    return df
+
+def load_data_from_file(filename: str = "cached_data.parquet") -> pd.DataFrame:
+    """Load DataFrame from Parquet (or legacy JSON) file"""
     try:
         filepath = os.path.join('data', filename)
+        if not os.path.exists(filepath) and filename == "cached_data.parquet":
+            # Fall back to a cache saved before the Parquet migration
+            legacy_path = os.path.join('data', "cached_data.json")
+            if os.path.exists(legacy_path):
+                filepath = legacy_path
         if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                data_dict = json.load(f)
-            
-            # Convert back to DataFrame
-            df = pd.DataFrame(data_dict['data'])
-            
-            # Convert date columns back to datetime if they exist
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'], errors='coerce')
-            
-            # Remove duplicates keeping highest engine hours
-            df = remove_duplicates_keep_highest(df)
-            
-            return df
+            # Cache key includes mtime so a fresh save invalidates the cache
+            return _load_data_cached(filepath, os.path.getmtime(filepath))
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return pd.DataFrame()
-    
+
     return pd.DataFrame()
 
 def remove_duplicates_keep_highest(df: pd.DataFrame) -> pd.DataFrame:
@@ -67,16 +80,28 @@ def remove_duplicates_keep_highest(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty or 'nickname' not in df.columns or 'engine_hours' not in df.columns:
         return df
     
-    original_count = len(df)
     duplicate_count = df.duplicated(subset=['nickname']).sum()
-    
-    # Sort by engine_hours in descending order and drop duplicates by nickname
-    # This keeps the first occurrence which will be the highest engine hours
-    cleaned_df = df.sort_values('engine_hours', ascending=False).drop_duplicates(
-        subset=['nickname'], keep='first'
-    )
-    
-    # Sort back by nickname for consistent display
+
+    # Rows without hours are split off first: idxmax raises on groups that
+    # are all-NaN, and such a row should survive only when its nickname has
+    # no valued row at all (matching the old sort+drop_duplicates behavior)
+    hours_na = df['engine_hours'].isna()
+    with_hours = df.loc[~hours_na]
+    without_hours = df.loc[hours_na].drop_duplicates(subset=['nickname'])
+    without_hours = without_hours[
+        ~without_hours['nickname'].isin(with_hours['nickname'])
+    ]
+
+    # Keep the row with the highest engine hours per nickname via a hash-based
+    # groupby reduction — O(N) instead of sorting the whole frame
+    idx = with_hours.groupby(
+        'nickname', sort=False, observed=True, dropna=False
+    )['engine_hours'].idxmax()
+    cleaned_df = with_hours.loc[idx]
+    if not without_hours.empty:
+        cleaned_df = pd.concat([cleaned_df, without_hours])
+
+    # Sort by nickname for consistent display
     cleaned_df = cleaned_df.sort_values('nickname').reset_index(drop=True)
     
     # Show info about removed duplicates
@@ -85,12 +110,31 @@ def remove_duplicates_keep_highest(df: pd.DataFrame) -> pd.DataFrame:
     
     return cleaned_df
 
+def get_data() -> pd.DataFrame:
+    """Fold pending uploads into the running frame and return it.
+
+    New uploads accumulate in st.session_state.uploaded_data; they are merged
+    here with one concat + dedup pass instead of paying a full-history
+    concat per uploaded file."""
+    pending = st.session_state.uploaded_data
+    if pending:
+        base = st.session_state.processed_data
+        frames = ([base] if not base.empty else []) + pending
+        combined = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        st.session_state.processed_data = remove_duplicates_keep_highest(combined)
+        st.session_state.uploaded_data = []
+
+        # Auto-save the updated data
+        save_data_to_file(st.session_state.processed_data)
+
+    return st.session_state.processed_data
+
 def list_saved_data_files() -> List[str]:
     """List all saved data files"""
     try:
         data_dir = 'data'
         if os.path.exists(data_dir):
-            files = [f for f in os.listdir(data_dir) if f.endswith('.json')]
+            files = [f for f in os.listdir(data_dir) if f.endswith(('.parquet', '.json'))]
             return files
     except:
         pass
@@ -140,52 +184,109 @@ class DataProcessor:
     def __init__(self):
         self.nickname_columns = ['nickname', 'name', 'tractor_name', 'id', 'identifier']
         self.engine_hours_columns = [
-            'last_known_engine_hrs', 'engine_hours', 'hours', 
+            'last_known_engine_hrs', 'engine_hours', 'hours',
             'last_engine_hours', 'engine_hrs', 'total_hours'
         ]
-    
+        self.date_columns = ['date', 'timestamp', 'created_date', 'last_updated']
+        self.location_columns = ['location', 'field', 'site', 'area']
+
     def process_files(self, uploaded_files: List) -> pd.DataFrame:
         """Process multiple uploaded files and return combined DataFrame"""
-        
+
+        # Hand off (name, bytes) payloads so repeat reruns hit the cache
+        file_payloads = tuple((file.name, file.getvalue()) for file in uploaded_files)
+        return _process_files_cached(file_payloads)
+
+    def process_file_payloads(self, file_payloads: Tuple) -> pd.DataFrame:
+        """Process (filename, bytes) payloads and return combined DataFrame"""
+
         all_data = []
-        
-        for file in uploaded_files:
+
+        for filename, file_bytes in file_payloads:
             try:
                 # Read the file based on its extension
-                file_extension = file.name.split('.')[-1].lower()
-                
+                file_extension = filename.split('.')[-1].lower()
+
                 if file_extension == 'csv':
-                    df = pd.read_csv(file)
+                    df = self._read_csv_projected(file_bytes)
                 elif file_extension in ['xlsx', 'xls']:
-                    df = pd.read_excel(file)
+                    df = self._read_excel(file_bytes, file_extension)
                 else:
-                    st.warning(f"Unsupported file format: {file.name}")
+                    st.warning(f"Unsupported file format: {filename}")
                     continue
-                
+
                 # Process the DataFrame
-                processed_df = self._process_dataframe(df, file.name)
-                
+                processed_df = self._process_dataframe(df, filename)
+
                 if not processed_df.empty:
                     all_data.append(processed_df)
-                    st.success(f"✅ Successfully processed: {file.name}")
+                    st.success(f"✅ Successfully processed: {filename}")
                 else:
-                    st.warning(f"⚠️ No valid data found in: {file.name}")
-                
+                    st.warning(f"⚠️ No valid data found in: {filename}")
+
             except Exception as e:
-                st.error(f"❌ Error processing {file.name}: {str(e)}")
-        
+                st.error(f"❌ Error processing {filename}: {str(e)}")
+
         if all_data:
             combined_df = pd.concat(all_data, ignore_index=True)
+            if 'date' in combined_df.columns:
+                # One batched parse; format='mixed' infers per element so
+                # files with different date layouts don't coerce each other
+                # to NaT, and cache=True parses each unique string once
+                combined_df['date'] = pd.to_datetime(
+                    combined_df['date'], format='mixed', errors='coerce', cache=True
+                )
             return combined_df
         else:
             return pd.DataFrame()
-    
+
+    def _read_excel(self, file_bytes: bytes, extension: str) -> pd.DataFrame:
+        """Read an Excel file, preferring the streaming calamine engine"""
+        try:
+            # calamine parses straight into typed arrays, several times
+            # faster than openpyxl and with far less memory
+            return pd.read_excel(io.BytesIO(file_bytes), engine='calamine')
+        except ImportError:
+            if extension == 'xls':
+                # openpyxl cannot parse legacy BIFF files; xlrd can
+                return pd.read_excel(io.BytesIO(file_bytes), engine='xlrd')
+            # read_only streams cells instead of materializing the workbook
+            return pd.read_excel(
+                io.BytesIO(file_bytes),
+                engine='openpyxl',
+                engine_kwargs={'read_only': True, 'data_only': True}
+            )
+
+    def _read_csv_projected(self, file_bytes: bytes) -> pd.DataFrame:
+        """Read a CSV with the Arrow engine, parsing only the columns we use"""
+
+        # Cheap header-only sniff to resolve the columns of interest
+        header = pd.read_csv(io.BytesIO(file_bytes), nrows=0)
+        lowered = {col: col.strip().lower() for col in header.columns}
+
+        wanted = []
+        for possible_names in (self.nickname_columns, self.engine_hours_columns,
+                               self.date_columns, self.location_columns):
+            match = self._find_column(lowered.values(), possible_names)
+            if match:
+                wanted.extend(col for col, low in lowered.items() if low == match)
+
+        if not wanted:
+            # No usable columns; let _process_dataframe report the mismatch
+            return header
+
+        return pd.read_csv(
+            io.BytesIO(file_bytes),
+            engine='pyarrow',
+            usecols=list(dict.fromkeys(wanted))
+        )
+
     def _process_dataframe(self, df: pd.DataFrame, filename: str) -> pd.DataFrame:
         """Process individual DataFrame to standardize column names"""
-        
-        # Make column names lowercase for easier matching
-        df_lower = df.copy()
-        df_lower.columns = df_lower.columns.str.lower().str.strip()
+
+        # Make column names lowercase for easier matching; rename only swaps
+        # the column Index, sharing the data blocks instead of copying them
+        df_lower = df.rename(columns=lambda c: c.strip().lower())
         
         # Find nickname column
         nickname_col = self._find_column(df_lower.columns, self.nickname_columns)
@@ -206,20 +307,19 @@ class DataProcessor:
             'source_file': filename
         })
         
-        # Add hours to 900 column
-        processed_df['hours_to_900'] = 900 - processed_df['engine_hours']
-        processed_df['hours_to_900'] = processed_df['hours_to_900'].apply(
-            lambda x: max(0, x) if pd.notna(x) else 0
+        # Add hours to 900 column (vectorized: one NumPy pass instead of a
+        # Python lambda per row)
+        processed_df['hours_to_900'] = (
+            (900 - processed_df['engine_hours']).clip(lower=0).fillna(0)
         )
         
-        # Add additional columns if they exist
-        date_columns = ['date', 'timestamp', 'created_date', 'last_updated']
-        date_col = self._find_column(df_lower.columns, date_columns)
+        # Add additional columns if they exist; dates stay raw here and are
+        # parsed in one batch over the combined frame in process_file_payloads
+        date_col = self._find_column(df_lower.columns, self.date_columns)
         if date_col:
-            processed_df['date'] = pd.to_datetime(df_lower[date_col], errors='coerce')
-        
-        location_columns = ['location', 'field', 'site', 'area']
-        location_col = self._find_column(df_lower.columns, location_columns)
+            processed_df['date'] = df_lower[date_col]
+
+        location_col = self._find_column(df_lower.columns, self.location_columns)
         if location_col:
             processed_df['location'] = df_lower[location_col]
         
@@ -232,139 +332,416 @@ class DataProcessor:
     def _find_column(self, columns, possible_names: List[str]) -> Optional[str]:
         """Find the best matching column name"""
         column_list = list(columns)
+
+        # Exact matches resolve via hashed set lookup instead of scanning the
+        # candidate list for every column
+        name_set = frozenset(possible_names)
         for col in column_list:
-            if col in possible_names:
+            if col in name_set:
                 return col
-        
-        # Try partial matching
+
+        # Try partial matching only when nothing matched exactly (substring
+        # checks are kept so matches across '_' boundaries still resolve)
         for col in column_list:
             for name in possible_names:
                 if name in col or col in name:
                     return col
-        
+
         return None
 
+@st.cache_data(show_spinner=False)
+def _process_files_cached(file_payloads: Tuple) -> pd.DataFrame:
+    """Parse and standardize uploaded files, memoized on (filename, bytes) payloads"""
+    processor = DataProcessor()
+    return processor.process_file_payloads(file_payloads)
+
 # ================================
 # VISUALIZATIONS CLASS
 # ================================
+
+# Hash DataFrames by content so identical data hits the figure cache
+_DF_HASH_FUNCS = {
+    pd.DataFrame: lambda d: pd.util.hash_pandas_object(d, index=False).values.tobytes()
+}
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _engine_hour_stats(df: pd.DataFrame):
+    """One pass over engine_hours shared by the metric row, the milestone
+    panels and the filter defaults; memoized on the data contents"""
+    hours = df['engine_hours'].to_numpy()
+    mask_under = hours < 900
+    stats = {
+        'min': float(hours.min()),
+        'max': float(hours.max()),
+        'mean': float(hours.mean()),
+        'n_under': int(mask_under.sum())
+    }
+    return stats, mask_under
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a frame to CSV bytes in one buffer; memoized so reruns with
+    an unchanged filter reuse the rendered bytes"""
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _to_excel_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a frame to xlsx bytes; memoized so reruns that don't change
+    the filtered data skip the workbook build entirely"""
+    buffer = io.BytesIO()
+    # Note: xlsxwriter's constant_memory mode must not be combined with
+    # to_excel — pandas writes column-by-column while constant_memory
+    # flushes rows as soon as a later row is touched, silently dropping
+    # every column after the first
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Tractor Data', index=False)
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _cached_bar_chart(df: pd.DataFrame, presorted: bool = False) -> "go.Figure":
+    """Build the engine-hours bar chart; memoized on the data contents"""
+    import plotly.express as px
+
+    # Sort by engine hours for better visualization (skipped when the caller
+    # already hands us a presorted frame)
+    df_sorted = df if presorted else df.sort_values('engine_hours', ascending=True)
+
+    fig = px.bar(
+        df_sorted,
+        x='engine_hours',
+        y='nickname',
+        orientation='h',
+        title='Engine Hours by Tractor',
+        labels={'engine_hours': 'Engine Hours', 'nickname': 'Tractor Nickname'},
+        color='engine_hours',
+        color_continuous_scale='Viridis'
+    )
+
+    fig.update_layout(
+        height=max(400, len(df) * 25),
+        showlegend=False,
+        xaxis_title="Engine Hours",
+        yaxis_title="Tractor Nickname"
+    )
+
+    return fig
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _cached_scatter_plot(df: pd.DataFrame) -> "go.Figure":
+    """Build the engine-hours scatter plot; memoized on the data contents"""
+    import plotly.graph_objects as go
+
+    # One WebGL trace colored by nickname codes instead of one SVG trace per
+    # nickname — keeps the browser render cost flat as the fleet grows
+    nicknames = df['nickname'].to_numpy()
+
+    fig = go.Figure(
+        go.Scattergl(
+            x=np.arange(len(df)),
+            y=df['engine_hours'].to_numpy(),
+            mode='markers',
+            marker=dict(
+                color=pd.Categorical(df['nickname']).codes,
+                colorscale='Viridis'
+            ),
+            text=nicknames,
+            hovertemplate='<b>%{text}</b><br>Engine Hours: %{y}<extra></extra>'
+        )
+    )
+
+    fig.update_layout(
+        title='Engine Hours Distribution',
+        height=500,
+        xaxis_title="Tractor Index",
+        yaxis_title="Engine Hours"
+    )
+
+    return fig
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _cached_line_chart(df: pd.DataFrame) -> Optional["go.Figure"]:
+    """Build the engine-hours-over-time line chart; memoized on the data contents"""
+    import plotly.express as px
+
+    if 'date' not in df.columns:
+        return None
+
+    # Sort by date
+    df_sorted = df.sort_values('date')
+
+    fig = px.line(
+        df_sorted,
+        x='date',
+        y='engine_hours',
+        color='nickname',
+        title='Engine Hours Over Time',
+        labels={'date': 'Date', 'engine_hours': 'Engine Hours'},
+        markers=True
+    )
+
+    fig.update_layout(
+        height=500,
+        xaxis_title="Date",
+        yaxis_title="Engine Hours"
+    )
+
+    return fig
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _cached_box_plot(df: pd.DataFrame) -> "go.Figure":
+    """Build the engine-hours box plot; memoized on the data contents"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    fig = px.box(
+        df,
+        y='engine_hours',
+        title='Engine Hours Distribution Analysis',
+        labels={'engine_hours': 'Engine Hours'}
+    )
+
+    # Add individual points
+    fig.add_trace(
+        go.Scatter(
+            x=np.zeros(len(df), dtype=np.int8),
+            y=df['engine_hours'],
+            mode='markers',
+            marker=dict(color='red', size=4, opacity=0.6),
+            text=df['nickname'],
+            hovertemplate='<b>%{text}</b><br>Engine Hours: %{y}<extra></extra>',
+            name='Individual Tractors'
+        )
+    )
+
+    fig.update_layout(
+        height=500,
+        showlegend=True,
+        yaxis_title="Engine Hours"
+    )
+
+    return fig
+
 class Visualizations:
     """Creates various visualizations for tractor engine hours data"""
-    
+
     def __init__(self):
+        import plotly.express as px
         self.color_palette = px.colors.qualitative.Set3
-    
-    def create_bar_chart(self, df: pd.DataFrame) -> go.Figure:
+
+    def create_bar_chart(self, df: pd.DataFrame, presorted: bool = False) -> "go.Figure":
         """Create a bar chart of engine hours by tractor nickname"""
-        
-        # Sort by engine hours for better visualization
-        df_sorted = df.sort_values('engine_hours', ascending=True)
-        
-        fig = px.bar(
-            df_sorted,
-            x='engine_hours',
-            y='nickname',
-            orientation='h',
-            title='Engine Hours by Tractor',
-            labels={'engine_hours': 'Engine Hours', 'nickname': 'Tractor Nickname'},
-            color='engine_hours',
-            color_continuous_scale='Viridis'
-        )
-        
-        fig.update_layout(
-            height=max(400, len(df) * 25),
-            showlegend=False,
-            xaxis_title="Engine Hours",
-            yaxis_title="Tractor Nickname"
-        )
-        
-        return fig
-    
-    def create_scatter_plot(self, df: pd.DataFrame) -> go.Figure:
+        return _cached_bar_chart(df, presorted)
+
+    def create_scatter_plot(self, df: pd.DataFrame) -> "go.Figure":
         """Create a scatter plot of engine hours distribution"""
-        
-        # Create index for x-axis if no date column
-        df_plot = df.copy()
-        df_plot['index'] = range(len(df_plot))
-        
-        fig = px.scatter(
-            df_plot,
-            x='index',
-            y='engine_hours',
-            color='nickname',
-            title='Engine Hours Distribution',
-            labels={'index': 'Tractor Index', 'engine_hours': 'Engine Hours'},
-            hover_data=['nickname', 'engine_hours']
-        )
-        
-        fig.update_layout(
-            height=500,
-            xaxis_title="Tractor Index",
-            yaxis_title="Engine Hours"
-        )
-        
-        return fig
-    
-    def create_line_chart(self, df: pd.DataFrame) -> Optional[go.Figure]:
+        return _cached_scatter_plot(df)
+
+    def create_line_chart(self, df: pd.DataFrame) -> Optional["go.Figure"]:
         """Create a line chart showing engine hours over time"""
-        
-        if 'date' not in df.columns:
-            return None
-        
-        # Sort by date
-        df_sorted = df.sort_values('date')
-        
-        fig = px.line(
-            df_sorted,
-            x='date',
-            y='engine_hours',
-            color='nickname',
-            title='Engine Hours Over Time',
-            labels={'date': 'Date', 'engine_hours': 'Engine Hours'},
-            markers=True
-        )
-        
-        fig.update_layout(
-            height=500,
-            xaxis_title="Date",
-            yaxis_title="Engine Hours"
-        )
-        
-        return fig
-    
-    def create_box_plot(self, df: pd.DataFrame) -> go.Figure:
+        return _cached_line_chart(df)
+
+    def create_box_plot(self, df: pd.DataFrame) -> "go.Figure":
         """Create a box plot for engine hours distribution analysis"""
-        
-        fig = px.box(
-            df,
-            y='engine_hours',
-            title='Engine Hours Distribution Analysis',
-            labels={'engine_hours': 'Engine Hours'}
+        return _cached_box_plot(df)
+
+# ================================
+# MAIN APPLICATION
+# ================================
+
+# Welcome-screen sample data: pure literals, so build the frames and the CSV
+# bytes once at import instead of on every welcome-screen rerun
+_SAMPLE_DF = pd.DataFrame({
+    'nickname': ['Tractor_A', 'Tractor_B', 'Tractor_C'],
+    'last_known_engine_hrs': [1250.5, 890.2, 2100.0],
+    'date': ['2025-10-14', '2025-10-14', '2025-10-14'],
+    'location': ['Field_1', 'Field_2', 'Field_3']
+})
+_SAMPLE_DF['hours_to_900'] = (900 - _SAMPLE_DF['last_known_engine_hrs']).clip(lower=0)
+_SAMPLE_DISPLAY = pd.DataFrame({
+    'Nickname': _SAMPLE_DF['nickname'],
+    'Engine Hours': _SAMPLE_DF['last_known_engine_hrs'],
+    'Hours to 900': _SAMPLE_DF['hours_to_900'],
+    'Date': _SAMPLE_DF['date'],
+    'Location': _SAMPLE_DF['location']
+})
+_SAMPLE_CSV = _SAMPLE_DF.to_csv(index=False).encode()
+
+@st.fragment
+def _render_dashboard(data: pd.DataFrame, viz_options: List[str]):
+    """Metrics, charts and milestone panels — reruns independently of the
+    data-table fragment so filter tweaks don't rebuild every figure"""
+
+    # Shared by the metrics, the milestone charts and the closest-to-900
+    # panel — one cached pass instead of a scan per consumer
+    hours_stats, mask_under_900 = _engine_hour_stats(data)
+    tractors_under_900 = hours_stats['n_under']
+    tractors_over_900 = len(data) - tractors_under_900
+
+    # Sort once per render and share the result with every consumer that
+    # wants hours-ordered data
+    data_sorted_by_hours = data.sort_values('engine_hours', ascending=True)
+
+    # Data overview
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Total Tractors", len(data))
+    with col2:
+        st.metric("Average Engine Hours", f"{hours_stats['mean']:.1f}")
+    with col3:
+        st.metric("Max Engine Hours", f"{hours_stats['max']:.1f}")
+    with col4:
+        st.metric("Min Engine Hours", f"{hours_stats['min']:.1f}")
+    with col5:
+        st.metric("Tractors Under 900 hrs", tractors_under_900)
+
+    # Visualizations
+    viz = Visualizations()
+
+    if "Bar Chart" in viz_options:
+        st.subheader("📊 Engine Hours by Tractor")
+        fig_bar = viz.create_bar_chart(data_sorted_by_hours, presorted=True)
+        st.plotly_chart(fig_bar, width='stretch', key='bar_chart')
+
+    if "Scatter Plot" in viz_options:
+        st.subheader("🔍 Engine Hours Distribution")
+        fig_scatter = viz.create_scatter_plot(data)
+        st.plotly_chart(fig_scatter, width='stretch', key='scatter_plot')
+
+    if "Line Chart" in viz_options:
+        st.subheader("📈 Engine Hours Trend")
+        if 'date' in data.columns:
+            fig_line = viz.create_line_chart(data)
+            st.plotly_chart(fig_line, width='stretch', key='line_chart')
+        else:
+            st.info("Date column not found. Line chart requires date information.")
+
+    if "Box Plot" in viz_options:
+        st.subheader("📦 Engine Hours Distribution Analysis")
+        fig_box = viz.create_box_plot(data)
+        st.plotly_chart(fig_box, width='stretch', key='box_plot')
+
+    # Additional visualization for 900 hour milestone
+    st.subheader("🎯 900 Hour Milestone Analysis")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Chart showing tractors by their proximity to 900 hours
+        import plotly.express as px
+        milestone_data = pd.DataFrame({
+            'Status': ['Under 900 hrs', 'Over 900 hrs'],
+            'Count': [tractors_under_900, tractors_over_900]
+        })
+
+        fig_milestone = px.pie(
+            milestone_data, 
+            values='Count', 
+            names='Status',
+            title='Tractors by 900 Hour Milestone',
+            color_discrete_map={
+                'Under 900 hrs': '#90EE90',
+                'Over 900 hrs': '#FFB6C1'
+            }
         )
-        
-        # Add individual points
-        fig.add_trace(
-            go.Scatter(
-                x=[0] * len(df),
-                y=df['engine_hours'],
-                mode='markers',
-                marker=dict(color='red', size=4, opacity=0.6),
-                text=df['nickname'],
-                hovertemplate='<b>%{text}</b><br>Engine Hours: %{y}<extra></extra>',
-                name='Individual Tractors'
+        st.plotly_chart(fig_milestone, width='stretch', key='milestone_pie')
+
+    with col2:
+        # Show tractors closest to 900 hours
+        under_900 = data.loc[mask_under_900]
+        if not under_900.empty:
+            # Bounded heap selection: no full sort just to keep 10 rows
+            under_900_sorted = under_900.nsmallest(10, 'hours_to_900')
+
+            fig_closest = px.bar(
+                under_900_sorted,
+                x='hours_to_900',
+                y='nickname',
+                orientation='h',
+                title='Tractors Closest to 900 Hours',
+                labels={'hours_to_900': 'Hours Remaining to 900', 'nickname': 'Tractor'},
+                color='hours_to_900',
+                color_continuous_scale='RdYlGn_r'
             )
+            fig_closest.update_layout(height=400)
+            st.plotly_chart(fig_closest, width='stretch', key='closest_bar')
+        else:
+            st.info("All tractors have exceeded 900 hours!")
+
+@st.fragment
+def _render_table_and_exports(data: pd.DataFrame):
+    """Filter widgets, data table and exports — filter changes rerun only
+    this fragment instead of the whole dashboard"""
+
+    # Data table
+    st.subheader("📋 Data Table")
+
+    # Filters
+    col1, col2 = st.columns(2)
+    with col1:
+        min_hours = st.number_input("Min Engine Hours", value=0)
+    with col2:
+        max_hours = st.number_input(
+            "Max Engine Hours", value=int(_engine_hour_stats(data)[0]['max'])
         )
-        
-        fig.update_layout(
-            height=500,
-            showlegend=True,
-            yaxis_title="Engine Hours"
+
+    filtered_data = data[data['engine_hours'].between(min_hours, max_hours)]
+
+    # Format the data for display: rename swaps only the column Index (no
+    # block copy) and the aliased columns are dropped by the final selection
+    rename_map = {
+        'nickname': 'Nickname',
+        'engine_hours': 'Engine Hours',
+        'hours_to_900': 'Hours to 900',
+        'source_file': 'Source File',
+        'date': 'Date',
+        'location': 'Location'
+    }
+    display_data = filtered_data.rename(columns=rename_map)
+    display_data['Engine Hours'] = display_data['Engine Hours'].round(1)
+    display_data['Hours to 900'] = display_data['Hours to 900'].round(1)
+
+    # Add status column (vectorized; categorical ships two codes plus a
+    # tiny dictionary to the frontend instead of one string per row)
+    display_data['Status'] = pd.Categorical(np.where(
+        filtered_data['engine_hours'].values >= 900,
+        "🔴 Over 900 hrs", "🟢 Under 900 hrs"
+    ))
+
+    # Select columns for display
+    columns_to_show = ['Nickname', 'Engine Hours', 'Hours to 900', 'Status', 'Source File']
+    if 'Date' in display_data.columns:
+        columns_to_show.insert(-1, 'Date')
+    if 'Location' in display_data.columns:
+        columns_to_show.insert(-1, 'Location')
+
+    st.dataframe(
+        display_data[columns_to_show],
+        width='stretch',
+        hide_index=True
+    )
+
+    # Export functionality
+    st.subheader("💾 Export Data")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.download_button(
+            label="📄 Download as CSV",
+            data=_to_csv_bytes(filtered_data),
+            file_name="agtegra_tractor_hours.csv",
+            mime="text/csv"
+        )
+
+    with col2:
+        # Excel export, built once per distinct filtered frame
+        st.download_button(
+            label="📗 Download as Excel",
+            data=_to_excel_bytes(filtered_data),
+            file_name="agtegra_tractor_hours.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
-        
-        return fig
 
-# ================================
-# MAIN APPLICATION
-# ================================
 def main():
     st.set_page_config(
         page_title="Agtegra Tractors Hours",
@@ -388,6 +765,9 @@ def main():
     if 'data_cache' not in st.session_state:
         st.session_state.data_cache = None
 
+    # Fold in any uploads accepted on the previous run
+    get_data()
+
     # Sidebar for controls
     with st.sidebar:
         st.header("📁 File Upload")
@@ -409,6 +789,9 @@ def main():
                 st.session_state.processed_data = pd.DataFrame()
                 st.session_state.uploaded_data = []
                 st.session_state.data_cache = None
+                # Forget accepted uploads so re-adding the same files after
+                # a clear is not silently ignored
+                st.session_state.pop('last_upload_sig', None)
                 st.rerun()
         
         # Load saved data files
@@ -429,28 +812,31 @@ def main():
         uploaded_files = file_uploader.render()
         
         if uploaded_files:
-            processor = DataProcessor()
-            new_data = processor.process_files(uploaded_files)
-            
-            if not new_data.empty:
-                # Add new data to existing data
-                if not st.session_state.processed_data.empty:
-                    combined_data = pd.concat([
-                        st.session_state.processed_data, 
-                        new_data
-                    ], ignore_index=True)
-                    
-                    # Remove duplicates by keeping the highest engine hours for each nickname
-                    st.session_state.processed_data = remove_duplicates_keep_highest(combined_data)
-                else:
-                    st.session_state.processed_data = remove_duplicates_keep_highest(new_data)
-                
-                # Auto-save the updated data
-                save_data_to_file(st.session_state.processed_data)
-                
-                st.success(f"✅ Processed {len(uploaded_files)} file(s)")
-                st.info("💾 Data automatically saved!")
-                st.rerun()
+            # Only process uploads we haven't accepted yet, so reruns while
+            # the uploader still holds the files don't reprocess them.
+            # Content digests (not name+size) so a replaced file with the
+            # same byte size is still picked up
+            upload_sig = tuple(
+                hashlib.sha256(file.getvalue()).digest() for file in uploaded_files
+            )
+            if upload_sig != st.session_state.get('last_upload_sig'):
+                st.session_state.last_upload_sig = upload_sig
+
+                processor = DataProcessor()
+                new_data = processor.process_files(uploaded_files)
+
+                if not new_data.empty:
+                    # Reduce the batch to its per-nickname maxima before
+                    # queueing, so the fold in get_data() merges only
+                    # O(unique + new) rows — the running frame is already
+                    # unique per nickname
+                    st.session_state.uploaded_data.append(
+                        remove_duplicates_keep_highest(new_data)
+                    )
+
+                    st.success(f"✅ Processed {len(uploaded_files)} file(s)")
+                    st.info("💾 Data automatically saved!")
+                    st.rerun()
 
         st.header("📊 Visualization Options")
         viz_options = st.multiselect(
@@ -462,161 +848,8 @@ def main():
     # Main content area
     if not st.session_state.processed_data.empty:
         data = st.session_state.processed_data
-        
-        # Data overview
-        col1, col2, col3, col4, col5 = st.columns(5)
-        with col1:
-            st.metric("Total Tractors", len(data))
-        with col2:
-            st.metric("Average Engine Hours", f"{data['engine_hours'].mean():.1f}")
-        with col3:
-            st.metric("Max Engine Hours", f"{data['engine_hours'].max():.1f}")
-        with col4:
-            st.metric("Min Engine Hours", f"{data['engine_hours'].min():.1f}")
-        with col5:
-            tractors_under_900 = len(data[data['engine_hours'] < 900])
-            st.metric("Tractors Under 900 hrs", tractors_under_900)
-
-        # Visualizations
-        viz = Visualizations()
-        
-        if "Bar Chart" in viz_options:
-            st.subheader("📊 Engine Hours by Tractor")
-            fig_bar = viz.create_bar_chart(data)
-            st.plotly_chart(fig_bar, width='stretch')
-
-        if "Scatter Plot" in viz_options:
-            st.subheader("🔍 Engine Hours Distribution")
-            fig_scatter = viz.create_scatter_plot(data)
-            st.plotly_chart(fig_scatter, width='stretch')
-
-        if "Line Chart" in viz_options:
-            st.subheader("📈 Engine Hours Trend")
-            if 'date' in data.columns:
-                fig_line = viz.create_line_chart(data)
-                st.plotly_chart(fig_line, width='stretch')
-            else:
-                st.info("Date column not found. Line chart requires date information.")
-
-        if "Box Plot" in viz_options:
-            st.subheader("📦 Engine Hours Distribution Analysis")
-            fig_box = viz.create_box_plot(data)
-            st.plotly_chart(fig_box, width='stretch')
-
-        # Additional visualization for 900 hour milestone
-        st.subheader("🎯 900 Hour Milestone Analysis")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Chart showing tractors by their proximity to 900 hours
-            tractors_over_900 = len(data[data['engine_hours'] >= 900])
-            tractors_under_900 = len(data[data['engine_hours'] < 900])
-            
-            milestone_data = pd.DataFrame({
-                'Status': ['Under 900 hrs', 'Over 900 hrs'],
-                'Count': [tractors_under_900, tractors_over_900]
-            })
-            
-            fig_milestone = px.pie(
-                milestone_data, 
-                values='Count', 
-                names='Status',
-                title='Tractors by 900 Hour Milestone',
-                color_discrete_map={
-                    'Under 900 hrs': '#90EE90',
-                    'Over 900 hrs': '#FFB6C1'
-                }
-            )
-            st.plotly_chart(fig_milestone, width='stretch')
-        
-        with col2:
-            # Show tractors closest to 900 hours
-            under_900 = data[data['engine_hours'] < 900].copy()
-            if not under_900.empty:
-                under_900_sorted = under_900.sort_values('hours_to_900').head(10)
-                
-                fig_closest = px.bar(
-                    under_900_sorted,
-                    x='hours_to_900',
-                    y='nickname',
-                    orientation='h',
-                    title='Tractors Closest to 900 Hours',
-                    labels={'hours_to_900': 'Hours Remaining to 900', 'nickname': 'Tractor'},
-                    color='hours_to_900',
-                    color_continuous_scale='RdYlGn_r'
-                )
-                fig_closest.update_layout(height=400)
-                st.plotly_chart(fig_closest, width='stretch')
-            else:
-                st.info("All tractors have exceeded 900 hours!")
-
-        # Data table
-        st.subheader("📋 Data Table")
-        
-        # Filters
-        col1, col2 = st.columns(2)
-        with col1:
-            min_hours = st.number_input("Min Engine Hours", value=0)
-        with col2:
-            max_hours = st.number_input("Max Engine Hours", value=int(data['engine_hours'].max()))
-
-        filtered_data = data[
-            (data['engine_hours'] >= min_hours) & 
-            (data['engine_hours'] <= max_hours)
-        ]
-
-        # Format the data for display
-        display_data = filtered_data.copy()
-        display_data['Engine Hours'] = display_data['engine_hours'].round(1)
-        display_data['Hours to 900'] = display_data['hours_to_900'].round(1)
-        display_data['Nickname'] = display_data['nickname']
-        display_data['Source File'] = display_data['source_file']
-        
-        # Add status column
-        display_data['Status'] = display_data['engine_hours'].apply(
-            lambda x: "🔴 Over 900 hrs" if x >= 900 else f"🟢 Under 900 hrs"
-        )
-        
-        # Select columns for display
-        columns_to_show = ['Nickname', 'Engine Hours', 'Hours to 900', 'Status', 'Source File']
-        if 'date' in filtered_data.columns:
-            display_data['Date'] = filtered_data['date']
-            columns_to_show.insert(-1, 'Date')
-        if 'location' in filtered_data.columns:
-            display_data['Location'] = filtered_data['location']
-            columns_to_show.insert(-1, 'Location')
-
-        st.dataframe(
-            display_data[columns_to_show],
-            width='stretch',
-            hide_index=True
-        )
-
-        # Export functionality
-        st.subheader("💾 Export Data")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            csv = filtered_data.to_csv(index=False)
-            st.download_button(
-                label="📄 Download as CSV",
-                data=csv,
-                file_name="agtegra_tractor_hours.csv",
-                mime="text/csv"
-            )
-        
-        with col2:
-            # Excel export
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                filtered_data.to_excel(writer, sheet_name='Tractor Data', index=False)
-            
-            st.download_button(
-                label="📗 Download as Excel",
-                data=buffer.getvalue(),
-                file_name="agtegra_tractor_hours.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        _render_dashboard(data, viz_options)
+        _render_table_and_exports(data)
 
     else:
         # Welcome message and sample data
@@ -637,33 +870,12 @@ def main():
         """)
         
         st.subheader("📋 Expected CSV Format")
-        sample_data = pd.DataFrame({
-            'nickname': ['Tractor_A', 'Tractor_B', 'Tractor_C'],
-            'last_known_engine_hrs': [1250.5, 890.2, 2100.0],
-            'date': ['2025-10-14', '2025-10-14', '2025-10-14'],
-            'location': ['Field_1', 'Field_2', 'Field_3']
-        })
-        
-        # Add the calculated column for display
-        sample_data['hours_to_900'] = 900 - sample_data['last_known_engine_hrs']
-        sample_data['hours_to_900'] = sample_data['hours_to_900'].apply(lambda x: max(0, x))
-        
-        # Format for display
-        display_sample = pd.DataFrame({
-            'Nickname': sample_data['nickname'],
-            'Engine Hours': sample_data['last_known_engine_hrs'],
-            'Hours to 900': sample_data['hours_to_900'],
-            'Date': sample_data['date'],
-            'Location': sample_data['location']
-        })
-        
-        st.dataframe(display_sample, width='stretch', hide_index=True)
-        
+        st.dataframe(_SAMPLE_DISPLAY, width='stretch', hide_index=True)
+
         # Sample data download
-        csv_sample = sample_data.to_csv(index=False)
         st.download_button(
             label="📄 Download Sample CSV",
-            data=csv_sample,
+            data=_SAMPLE_CSV,
             file_name="sample_agtegra_tractor_data.csv",
             mime="text/csv"
         )
@@ -1,17 +1,92 @@
-from flask import Flask, render_template, request, send_file, jsonify
+from flask import Flask, Response, render_template, request, send_file, jsonify
 import pandas as pd
+import numpy as np
 import plotly
 import plotly.express as px
 import plotly.graph_objects as go
 import json
 import io
 import base64
+import hashlib
+import re
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List, Optional
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
 
+def _json_response(payload, status: int = 200) -> Response:
+    """Serialize a response with orjson when available (~5x faster than the
+    stdlib encoder for large record payloads), falling back to jsonify"""
+    if orjson is not None:
+        # default=str covers pandas Timestamps and other scalar types that
+        # orjson does not serialize natively
+        return Response(
+            orjson.dumps(payload, default=str, option=orjson.OPT_SERIALIZE_NUMPY),
+            status=status,
+            mimetype='application/json'
+        )
+    response = jsonify(payload)
+    response.status_code = status
+    return response
+
+@lru_cache(maxsize=None)
+def _column_matchers(possible_names: tuple):
+    """Precompute the exact-match set and partial-match regex for a name list"""
+    pattern = re.compile("|".join(map(re.escape, possible_names)))
+    return frozenset(possible_names), pattern
+
+def _read_xlsx_streaming(file_bytes: bytes) -> pd.DataFrame:
+    """Stream an xlsx worksheet into a DataFrame without materializing cells"""
+    from openpyxl import load_workbook
+
+    # read_only walks the XML with a streaming parser instead of building a
+    # cell object per value; data_only returns computed values, not formulas
+    workbook = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = [str(col) if col is not None else '' for col in header]
+        return pd.DataFrame(list(rows), columns=columns)
+    finally:
+        workbook.close()
+
+# Parsed-upload cache keyed on a content digest: repeat uploads skip the
+# reparse without the worker retaining the (up to 50MB) payloads themselves
+_READ_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_READ_CACHE_MAX = 32
+
+def _read_file_bytes(file_bytes: bytes, extension: str) -> pd.DataFrame:
+    """Parse raw upload bytes; memoized on a SHA-256 of the content"""
+    key = (hashlib.sha256(file_bytes).digest(), extension)
+    cached = _READ_CACHE.get(key)
+    if cached is not None:
+        _READ_CACHE.move_to_end(key)
+        return cached
+
+    if extension == 'csv':
+        # pyarrow's multithreaded C++ reader is several times faster than
+        # the default parser
+        df = pd.read_csv(io.BytesIO(file_bytes), engine='pyarrow')
+    elif extension == 'xlsx':
+        df = _read_xlsx_streaming(file_bytes)
+    else:
+        df = pd.read_excel(io.BytesIO(file_bytes))
+
+    _READ_CACHE[key] = df
+    if len(_READ_CACHE) > _READ_CACHE_MAX:
+        _READ_CACHE.popitem(last=False)
+    return df
+
 class DataProcessor:
     """Processes uploaded CSV and Excel files"""
     
@@ -30,11 +105,9 @@ class DataProcessor:
             try:
                 # Read the file based on its extension
                 file_extension = file.filename.split('.')[-1].lower()
-                
-                if file_extension == 'csv':
-                    df = pd.read_csv(file)
-                elif file_extension in ['xlsx', 'xls']:
-                    df = pd.read_excel(file)
+
+                if file_extension in ('csv', 'xlsx', 'xls'):
+                    df = _read_file_bytes(file.read(), file_extension)
                 else:
                     continue
                 
@@ -56,9 +129,9 @@ class DataProcessor:
     def _process_dataframe(self, df: pd.DataFrame, filename: str) -> pd.DataFrame:
         """Process individual DataFrame to standardize column names"""
         
-        # Make column names lowercase for easier matching
-        df_lower = df.copy()
-        df_lower.columns = df_lower.columns.str.lower().str.strip()
+        # Make column names lowercase for easier matching; rename only swaps
+        # the column Index, sharing the data blocks instead of copying them
+        df_lower = df.rename(columns=lambda c: str(c).strip().lower())
         
         # Find nickname column
         nickname_col = self._find_column(df_lower.columns, self.nickname_columns)
@@ -77,10 +150,10 @@ class DataProcessor:
             'source_file': filename
         })
         
-        # Add hours to 900 column
-        processed_df['hours_to_900'] = 900 - processed_df['engine_hours']
-        processed_df['hours_to_900'] = processed_df['hours_to_900'].apply(
-            lambda x: max(0, x) if pd.notna(x) else 0
+        # Add hours to 900 column (vectorized: one NumPy pass instead of a
+        # Python lambda per row)
+        processed_df['hours_to_900'] = (
+            (900 - processed_df['engine_hours']).clip(lower=0).fillna(0)
         )
         
         # Add additional columns if they exist
@@ -103,16 +176,22 @@ class DataProcessor:
     def _find_column(self, columns, possible_names: List[str]) -> Optional[str]:
         """Find the best matching column name"""
         column_list = list(columns)
+        name_set, name_re = _column_matchers(tuple(possible_names))
+
+        # Exact matches resolve via hashed set lookup
         for col in column_list:
-            if col in possible_names:
+            if col in name_set:
                 return col
-        
-        # Try partial matching
+
+        # Partial matching: one compiled alternation instead of a nested
+        # substring scan, plus the reverse containment check
         for col in column_list:
+            if name_re.search(col):
+                return col
             for name in possible_names:
-                if name in col or col in name:
+                if col in name:
                     return col
-        
+
         return None
 
 @app.route('/')
@@ -139,7 +218,7 @@ def upload_files():
         return jsonify({'error': 'No valid data found in uploaded files'}), 400
     
     # Convert to JSON for frontend
-    return jsonify({
+    return _json_response({
         'success': True,
         'data': data.to_dict('records'),
         'summary': {
@@ -178,14 +257,23 @@ def create_visualizations():
             )
             
         elif chart_type == 'scatter':
-            df['index'] = range(len(df))
-            fig = px.scatter(
-                df,
-                x='index',
-                y='engine_hours',
-                color='nickname',
+            # One WebGL trace with nickname-coded colors instead of one SVG
+            # trace per tractor — render cost stays flat as the fleet grows
+            codes, uniques = pd.factorize(df['nickname'])
+            fig = go.Figure(
+                go.Scattergl(
+                    x=np.arange(len(df)),
+                    y=df['engine_hours'].to_numpy(),
+                    mode='markers',
+                    marker=dict(color=codes, colorscale='Viridis'),
+                    customdata=uniques[codes],
+                    hovertemplate='<b>%{customdata}</b><br>%{y} hrs<extra></extra>'
+                )
+            )
+            fig.update_layout(
                 title='Engine Hours Distribution',
-                labels={'index': 'Tractor Index', 'engine_hours': 'Engine Hours'}
+                xaxis_title='Tractor Index',
+                yaxis_title='Engine Hours'
             )
             
         elif chart_type == 'pie':
@@ -211,10 +299,11 @@ def create_visualizations():
         else:
             return jsonify({'error': 'Invalid chart type'}), 400
         
-        # Convert to JSON
-        graphJSON = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-        
-        return jsonify({
+        # fig.to_json serializes through orjson when it is installed,
+        # bypassing the slower PlotlyJSONEncoder/stdlib path
+        graphJSON = fig.to_json()
+
+        return _json_response({
             'success': True,
             'graph': graphJSON
         })
@@ -224,25 +313,27 @@ def create_visualizations():
 
 @app.route('/export', methods=['POST'])
 def export_data():
-    """Export data as CSV"""
-    
+    """Export data as streamed CSV"""
+
     data_json = request.json.get('data')
-    
+
     if not data_json:
         return jsonify({'error': 'No data provided'}), 400
-    
+
     df = pd.DataFrame(data_json)
-    
-    # Create CSV
-    output = io.StringIO()
-    df.to_csv(output, index=False)
-    csv_data = output.getvalue()
-    
-    return jsonify({
-        'success': True,
-        'csv_data': csv_data,
-        'filename': 'agtegra_tractor_hours.csv'
-    })
+
+    def generate():
+        # Stream the CSV in bounded chunks instead of materializing the
+        # whole file (and its JSON wrapper) in memory
+        yield df.head(0).to_csv(index=False)
+        for start in range(0, len(df), 10_000):
+            yield df.iloc[start:start + 10_000].to_csv(header=False, index=False)
+
+    return Response(
+        generate(),
+        mimetype='text/csv',
+        headers={'Content-Disposition': 'attachment; filename=agtegra_tractor_hours.csv'}
+    )
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -1,12 +1,56 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import io
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Tuple
 import numpy as np
 import re
 
+# ================================
+# EXPORT HELPERS
+# ================================
+@st.cache_data(show_spinner=False)
+def _to_excel_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a frame to xlsx bytes; the cache means reruns with
+    unchanged data skip the build"""
+    buffer = io.BytesIO()
+    # Note: xlsxwriter's constant_memory mode must not be combined with
+    # to_excel — pandas writes column-by-column while constant_memory
+    # flushes rows as soon as a later row is touched, silently dropping
+    # every column after the first
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Tractor Data', index=False)
+    return buffer.getvalue()
+
+# ================================
+# DATA CLEANING HELPERS
+# ================================
+def remove_duplicates_keep_highest(df: pd.DataFrame) -> pd.DataFrame:
+    """Remove duplicate nicknames, keeping only the record with highest engine hours"""
+    if df.empty or 'nickname' not in df.columns or 'engine_hours' not in df.columns:
+        return df
+
+    # Rows without hours are split off first: idxmax raises on groups that
+    # are all-NaN, and such a row should survive only when its nickname has
+    # no valued row at all
+    hours_na = df['engine_hours'].isna()
+    with_hours = df.loc[~hours_na]
+    without_hours = df.loc[hours_na].drop_duplicates(subset=['nickname'])
+    without_hours = without_hours[
+        ~without_hours['nickname'].isin(with_hours['nickname'])
+    ]
+
+    # Hash only the nickname column instead of every column of every row,
+    # and keep the max-hours row per nickname in one groupby reduction
+    idx = with_hours.groupby(
+        'nickname', sort=False, observed=True, dropna=False
+    )['engine_hours'].idxmax()
+    cleaned_df = with_hours.loc[idx]
+    if not without_hours.empty:
+        cleaned_df = pd.concat([cleaned_df, without_hours])
+
+    return cleaned_df.sort_values('nickname').reset_index(drop=True)
+
 # ================================
 # FILE UPLOADER CLASS
 # ================================
@@ -94,9 +138,9 @@ class DataProcessor:
     def _process_dataframe(self, df: pd.DataFrame, filename: str) -> pd.DataFrame:
         """Process individual DataFrame to standardize column names"""
         
-        # Make column names lowercase for easier matching
-        df_lower = df.copy()
-        df_lower.columns = df_lower.columns.str.lower().str.strip()
+        # Make column names lowercase for easier matching; rename only swaps
+        # the column Index, sharing the data blocks instead of copying them
+        df_lower = df.rename(columns=lambda c: str(c).strip().lower())
         
         # Find nickname column
         nickname_col = self._find_column(df_lower.columns, self.nickname_columns)
@@ -117,10 +161,10 @@ class DataProcessor:
             'source_file': filename
         })
         
-        # Add hours to 900 column
-        processed_df['hours_to_900'] = 900 - processed_df['engine_hours']
-        processed_df['hours_to_900'] = processed_df['hours_to_900'].apply(
-            lambda x: max(0, x) if pd.notna(x) else 0
+        # Add hours to 900 column (vectorized: one NumPy pass instead of a
+        # Python lambda per row)
+        processed_df['hours_to_900'] = (
+            (900 - processed_df['engine_hours']).clip(lower=0).fillna(0)
         )
         
         # Add additional columns if they exist
@@ -162,11 +206,13 @@ class Visualizations:
     """Creates various visualizations for tractor engine hours data"""
     
     def __init__(self):
+        import plotly.express as px
         self.color_palette = px.colors.qualitative.Set3
     
-    def create_bar_chart(self, df: pd.DataFrame) -> go.Figure:
+    def create_bar_chart(self, df: pd.DataFrame) -> "go.Figure":
         """Create a bar chart of engine hours by tractor nickname"""
-        
+        import plotly.express as px
+
         # Sort by engine hours for better visualization
         df_sorted = df.sort_values('engine_hours', ascending=True)
         
@@ -190,9 +236,10 @@ class Visualizations:
         
         return fig
     
-    def create_scatter_plot(self, df: pd.DataFrame) -> go.Figure:
+    def create_scatter_plot(self, df: pd.DataFrame) -> "go.Figure":
         """Create a scatter plot of engine hours distribution"""
-        
+        import plotly.express as px
+
         # Create index for x-axis if no date column
         df_plot = df.copy()
         df_plot['index'] = range(len(df_plot))
@@ -215,9 +262,10 @@ class Visualizations:
         
         return fig
     
-    def create_line_chart(self, df: pd.DataFrame) -> Optional[go.Figure]:
+    def create_line_chart(self, df: pd.DataFrame) -> Optional["go.Figure"]:
         """Create a line chart showing engine hours over time"""
-        
+        import plotly.express as px
+
         if 'date' not in df.columns:
             return None
         
@@ -242,9 +290,11 @@ class Visualizations:
         
         return fig
     
-    def create_box_plot(self, df: pd.DataFrame) -> go.Figure:
+    def create_box_plot(self, df: pd.DataFrame) -> "go.Figure":
         """Create a box plot for engine hours distribution analysis"""
-        
+        import plotly.express as px
+        import plotly.graph_objects as go
+
         fig = px.box(
             df,
             y='engine_hours',
@@ -255,7 +305,7 @@ class Visualizations:
         # Add individual points
         fig.add_trace(
             go.Scatter(
-                x=[0] * len(df),
+                x=np.zeros(len(df), dtype=np.int8),
                 y=df['engine_hours'],
                 mode='markers',
                 marker=dict(color='red', size=4, opacity=0.6),
@@ -276,6 +326,185 @@ class Visualizations:
 # ================================
 # MAIN APPLICATION
 # ================================
+@st.fragment
+def _render_dashboard(data: pd.DataFrame, viz_options: List[str]):
+    """Metrics, charts and milestone panels — reruns independently of the
+    data-table fragment so filter tweaks don't rebuild every figure"""
+
+    # Data overview
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Total Tractors", len(data))
+    with col2:
+        st.metric("Average Engine Hours", f"{data['engine_hours'].mean():.1f}")
+    with col3:
+        st.metric("Max Engine Hours", f"{data['engine_hours'].max():.1f}")
+    with col4:
+        st.metric("Min Engine Hours", f"{data['engine_hours'].min():.1f}")
+    with col5:
+        tractors_under_900 = len(data[data['engine_hours'] < 900])
+        st.metric("Tractors Under 900 hrs", tractors_under_900)
+
+    # Visualizations
+    viz = Visualizations()
+
+    # Build the selected figures concurrently — the pandas/plotly work in
+    # each builder spends most of its time in GIL-releasing C code, so the
+    # constructions overlap — then render them in order on the main thread
+    chart_builders = {
+        "Bar Chart": viz.create_bar_chart,
+        "Scatter Plot": viz.create_scatter_plot,
+        "Line Chart": viz.create_line_chart,
+        "Box Plot": viz.create_box_plot
+    }
+    selected = [name for name in chart_builders if name in viz_options]
+    figures = {}
+    if selected:
+        with ThreadPoolExecutor(max_workers=min(4, len(selected))) as executor:
+            figures = dict(zip(
+                selected,
+                executor.map(lambda name: chart_builders[name](data), selected)
+            ))
+
+    if "Bar Chart" in viz_options:
+        st.subheader("📊 Engine Hours by Tractor")
+        st.plotly_chart(figures["Bar Chart"], width='stretch')
+
+    if "Scatter Plot" in viz_options:
+        st.subheader("🔍 Engine Hours Distribution")
+        st.plotly_chart(figures["Scatter Plot"], width='stretch')
+
+    if "Line Chart" in viz_options:
+        st.subheader("📈 Engine Hours Trend")
+        if figures.get("Line Chart") is not None:
+            st.plotly_chart(figures["Line Chart"], width='stretch')
+        else:
+            st.info("Date column not found. Line chart requires date information.")
+
+    if "Box Plot" in viz_options:
+        st.subheader("📦 Engine Hours Distribution Analysis")
+        st.plotly_chart(figures["Box Plot"], width='stretch')
+
+    # Additional visualization for 900 hour milestone
+    st.subheader("🎯 900 Hour Milestone Analysis")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Chart showing tractors by their proximity to 900 hours
+        import plotly.express as px
+        tractors_over_900 = len(data[data['engine_hours'] >= 900])
+        tractors_under_900 = len(data[data['engine_hours'] < 900])
+        
+        milestone_data = pd.DataFrame({
+            'Status': ['Under 900 hrs', 'Over 900 hrs'],
+            'Count': [tractors_under_900, tractors_over_900]
+        })
+        
+        fig_milestone = px.pie(
+            milestone_data, 
+            values='Count', 
+            names='Status',
+            title='Tractors by 900 Hour Milestone',
+            color_discrete_map={
+                'Under 900 hrs': '#90EE90',
+                'Over 900 hrs': '#FFB6C1'
+            }
+        )
+        st.plotly_chart(fig_milestone, width='stretch')
+    
+    with col2:
+        # Show tractors closest to 900 hours
+        under_900 = data[data['engine_hours'] < 900].copy()
+        if not under_900.empty:
+            # Bounded heap selection instead of sorting everything to keep 10
+            under_900_sorted = under_900.nsmallest(10, 'hours_to_900')
+            
+            fig_closest = px.bar(
+                under_900_sorted,
+                x='hours_to_900',
+                y='nickname',
+                orientation='h',
+                title='Tractors Closest to 900 Hours',
+                labels={'hours_to_900': 'Hours Remaining to 900', 'nickname': 'Tractor'},
+                color='hours_to_900',
+                color_continuous_scale='RdYlGn_r'
+            )
+            fig_closest.update_layout(height=400)
+            st.plotly_chart(fig_closest, width='stretch')
+        else:
+            st.info("All tractors have exceeded 900 hours!")
+
+@st.fragment
+def _render_table_and_exports(data: pd.DataFrame):
+    """Filter widgets, data table and exports — filter changes rerun only
+    this fragment instead of the whole dashboard"""
+
+    # Data table
+    st.subheader("📋 Data Table")
+    
+    # Filters
+    col1, col2 = st.columns(2)
+    with col1:
+        min_hours = st.number_input("Min Engine Hours", value=0)
+    with col2:
+        max_hours = st.number_input("Max Engine Hours", value=int(data['engine_hours'].max()))
+
+    filtered_data = data[
+        (data['engine_hours'] >= min_hours) & 
+        (data['engine_hours'] <= max_hours)
+    ]
+
+    # Format the data for display
+    display_data = filtered_data.copy()
+    display_data['Engine Hours'] = display_data['engine_hours'].round(1)
+    display_data['Hours to 900'] = display_data['hours_to_900'].round(1)
+    display_data['Nickname'] = display_data['nickname']
+    display_data['Source File'] = display_data['source_file']
+    
+    # Add status column (vectorized; categorical ships two codes plus a
+    # tiny dictionary to the frontend instead of one string per row)
+    display_data['Status'] = pd.Categorical(np.where(
+        display_data['engine_hours'].values >= 900,
+        "🔴 Over 900 hrs", "🟢 Under 900 hrs"
+    ))
+    
+    # Select columns for display
+    columns_to_show = ['Nickname', 'Engine Hours', 'Hours to 900', 'Status', 'Source File']
+    if 'date' in filtered_data.columns:
+        display_data['Date'] = filtered_data['date']
+        columns_to_show.insert(-1, 'Date')
+    if 'location' in filtered_data.columns:
+        display_data['Location'] = filtered_data['location']
+        columns_to_show.insert(-1, 'Location')
+
+    st.dataframe(
+        display_data[columns_to_show],
+        width='stretch',
+        hide_index=True
+    )
+
+    # Export functionality
+    st.subheader("💾 Export Data")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        csv = filtered_data.to_csv(index=False)
+        st.download_button(
+            label="📄 Download as CSV",
+            data=csv,
+            file_name="agtegra_tractor_hours.csv",
+            mime="text/csv"
+        )
+    
+    with col2:
+        # Excel export, built once per distinct filtered frame
+        st.download_button(
+            label="📗 Download as Excel",
+            data=_to_excel_bytes(filtered_data),
+            file_name="agtegra_tractor_hours.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
 def main():
     st.set_page_config(
         page_title="Agtegra Tractors Hours",
@@ -288,8 +517,6 @@ def main():
     st.markdown("Upload multiple CSV files to compare tractor nicknames and engine hours")
 
     # Initialize session state
-    if 'uploaded_data' not in st.session_state:
-        st.session_state.uploaded_data = []
     if 'processed_data' not in st.session_state:
         st.session_state.processed_data = pd.DataFrame()
 
@@ -304,11 +531,16 @@ def main():
             new_data = processor.process_files(uploaded_files)
             
             if not new_data.empty:
-                st.session_state.uploaded_data.append(new_data)
-                st.session_state.processed_data = pd.concat(
-                    st.session_state.uploaded_data, 
-                    ignore_index=True
-                ).drop_duplicates()
+                # Append only the new rows to the running frame instead of
+                # rebuilding the full history from a list of frames
+                if st.session_state.processed_data.empty:
+                    combined = new_data
+                else:
+                    combined = pd.concat(
+                        [st.session_state.processed_data, new_data],
+                        ignore_index=True
+                    )
+                st.session_state.processed_data = remove_duplicates_keep_highest(combined)
                 st.success(f"✅ Processed {len(uploaded_files)} file(s)")
 
         st.header("📊 Visualization Options")
@@ -321,161 +553,8 @@ def main():
     # Main content area
     if not st.session_state.processed_data.empty:
         data = st.session_state.processed_data
-        
-        # Data overview
-        col1, col2, col3, col4, col5 = st.columns(5)
-        with col1:
-            st.metric("Total Tractors", len(data))
-        with col2:
-            st.metric("Average Engine Hours", f"{data['engine_hours'].mean():.1f}")
-        with col3:
-            st.metric("Max Engine Hours", f"{data['engine_hours'].max():.1f}")
-        with col4:
-            st.metric("Min Engine Hours", f"{data['engine_hours'].min():.1f}")
-        with col5:
-            tractors_under_900 = len(data[data['engine_hours'] < 900])
-            st.metric("Tractors Under 900 hrs", tractors_under_900)
-
-        # Visualizations
-        viz = Visualizations()
-        
-        if "Bar Chart" in viz_options:
-            st.subheader("📊 Engine Hours by Tractor")
-            fig_bar = viz.create_bar_chart(data)
-            st.plotly_chart(fig_bar, width='stretch')
-
-        if "Scatter Plot" in viz_options:
-            st.subheader("🔍 Engine Hours Distribution")
-            fig_scatter = viz.create_scatter_plot(data)
-            st.plotly_chart(fig_scatter, width='stretch')
-
-        if "Line Chart" in viz_options:
-            st.subheader("📈 Engine Hours Trend")
-            if 'date' in data.columns:
-                fig_line = viz.create_line_chart(data)
-                st.plotly_chart(fig_line, width='stretch')
-            else:
-                st.info("Date column not found. Line chart requires date information.")
-
-        if "Box Plot" in viz_options:
-            st.subheader("📦 Engine Hours Distribution Analysis")
-            fig_box = viz.create_box_plot(data)
-            st.plotly_chart(fig_box, width='stretch')
-
-        # Additional visualization for 900 hour milestone
-        st.subheader("🎯 900 Hour Milestone Analysis")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Chart showing tractors by their proximity to 900 hours
-            tractors_over_900 = len(data[data['engine_hours'] >= 900])
-            tractors_under_900 = len(data[data['engine_hours'] < 900])
-            
-            milestone_data = pd.DataFrame({
-                'Status': ['Under 900 hrs', 'Over 900 hrs'],
-                'Count': [tractors_under_900, tractors_over_900]
-            })
-            
-            fig_milestone = px.pie(
-                milestone_data, 
-                values='Count', 
-                names='Status',
-                title='Tractors by 900 Hour Milestone',
-                color_discrete_map={
-                    'Under 900 hrs': '#90EE90',
-                    'Over 900 hrs': '#FFB6C1'
-                }
-            )
-            st.plotly_chart(fig_milestone, width='stretch')
-        
-        with col2:
-            # Show tractors closest to 900 hours
-            under_900 = data[data['engine_hours'] < 900].copy()
-            if not under_900.empty:
-                under_900_sorted = under_900.sort_values('hours_to_900').head(10)
-                
-                fig_closest = px.bar(
-                    under_900_sorted,
-                    x='hours_to_900',
-                    y='nickname',
-                    orientation='h',
-                    title='Tractors Closest to 900 Hours',
-                    labels={'hours_to_900': 'Hours Remaining to 900', 'nickname': 'Tractor'},
-                    color='hours_to_900',
-                    color_continuous_scale='RdYlGn_r'
-                )
-                fig_closest.update_layout(height=400)
-                st.plotly_chart(fig_closest, width='stretch')
-            else:
-                st.info("All tractors have exceeded 900 hours!")
-
-        # Data table
-        st.subheader("📋 Data Table")
-        
-        # Filters
-        col1, col2 = st.columns(2)
-        with col1:
-            min_hours = st.number_input("Min Engine Hours", value=0)
-        with col2:
-            max_hours = st.number_input("Max Engine Hours", value=int(data['engine_hours'].max()))
-
-        filtered_data = data[
-            (data['engine_hours'] >= min_hours) & 
-            (data['engine_hours'] <= max_hours)
-        ]
-
-        # Format the data for display
-        display_data = filtered_data.copy()
-        display_data['Engine Hours'] = display_data['engine_hours'].round(1)
-        display_data['Hours to 900'] = display_data['hours_to_900'].round(1)
-        display_data['Nickname'] = display_data['nickname']
-        display_data['Source File'] = display_data['source_file']
-        
-        # Add status column
-        display_data['Status'] = display_data['engine_hours'].apply(
-            lambda x: "🔴 Over 900 hrs" if x >= 900 else f"🟢 Under 900 hrs"
-        )
-        
-        # Select columns for display
-        columns_to_show = ['Nickname', 'Engine Hours', 'Hours to 900', 'Status', 'Source File']
-        if 'date' in filtered_data.columns:
-            display_data['Date'] = filtered_data['date']
-            columns_to_show.insert(-1, 'Date')
-        if 'location' in filtered_data.columns:
-            display_data['Location'] = filtered_data['location']
-            columns_to_show.insert(-1, 'Location')
-
-        st.dataframe(
-            display_data[columns_to_show],
-            width='stretch',
-            hide_index=True
-        )
-
-        # Export functionality
-        st.subheader("💾 Export Data")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            csv = filtered_data.to_csv(index=False)
-            st.download_button(
-                label="📄 Download as CSV",
-                data=csv,
-                file_name="agtegra_tractor_hours.csv",
-                mime="text/csv"
-            )
-        
-        with col2:
-            # Excel export
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                filtered_data.to_excel(writer, sheet_name='Tractor Data', index=False)
-            
-            st.download_button(
-                label="📗 Download as Excel",
-                data=buffer.getvalue(),
-                file_name="agtegra_tractor_hours.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        _render_dashboard(data, viz_options)
+        _render_table_and_exports(data)
 
     else:
         # Welcome message and sample data
@@ -490,8 +569,7 @@ def main():
         })
         
         # Add the calculated column for display
-        sample_data['hours_to_900'] = 900 - sample_data['last_known_engine_hrs']
-        sample_data['hours_to_900'] = sample_data['hours_to_900'].apply(lambda x: max(0, x))
+        sample_data['hours_to_900'] = (900 - sample_data['last_known_engine_hrs']).clip(lower=0)
         
         # Format for display
         display_sample = pd.DataFrame({
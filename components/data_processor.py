@@ -1,8 +1,54 @@
 import streamlit as st
 import pandas as pd
 import io
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Optional
 
+@lru_cache(maxsize=None)
+def _column_matchers(possible_names: tuple):
+    """Precompute the exact-match set and partial-match regex for a name list"""
+    pattern = re.compile("|".join(map(re.escape, possible_names)))
+    return frozenset(possible_names), pattern
+
+def _read_xlsx_streaming(file_bytes: bytes) -> pd.DataFrame:
+    """Stream an xlsx worksheet into a DataFrame without materializing cells"""
+    from openpyxl import load_workbook
+
+    # read_only walks the XML with a streaming parser instead of building a
+    # cell object per value; data_only returns computed values, not formulas
+    workbook = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = [str(col) if col is not None else '' for col in header]
+        return pd.DataFrame(list(rows), columns=columns)
+    finally:
+        workbook.close()
+
+@st.cache_data(show_spinner=False)
+def _read_file_bytes(file_bytes: bytes, extension: str) -> pd.DataFrame:
+    """Parse raw upload bytes; memoized on content so reruns skip the reparse"""
+    if extension == 'csv':
+        # Sniff the header first: unsupported schemas skip the full parse
+        # entirely, and supported ones are read with column projection
+        header = pd.read_csv(io.BytesIO(file_bytes), nrows=0)
+        usecols = DataProcessor()._resolve_columns(header.columns)
+        if usecols is None:
+            # Required columns missing; hand back the header so
+            # _process_dataframe reports which one
+            return header
+
+        # pyarrow's multithreaded C++ reader is several times faster than
+        # the default parser, and usecols skips the unused columns
+        return pd.read_csv(io.BytesIO(file_bytes), engine='pyarrow', usecols=usecols)
+    if extension == 'xlsx':
+        return _read_xlsx_streaming(file_bytes)
+    return pd.read_excel(io.BytesIO(file_bytes))
+
 class DataProcessor:
     """Processes uploaded CSV and Excel files"""
     
@@ -12,37 +58,73 @@ class DataProcessor:
             'last_known_engine_hrs', 'engine_hours', 'hours', 
             'last_engine_hours', 'engine_hrs', 'total_hours'
         ]
-    
+        self.date_columns = ['date', 'timestamp', 'created_date', 'last_updated']
+        self.location_columns = ['location', 'field', 'site', 'area']
+
+    def _resolve_columns(self, columns) -> Optional[List[str]]:
+        """Map raw header names to the columns the app uses, or None when
+        the required nickname/hours columns are missing"""
+        lowered = {col: str(col).strip().lower() for col in columns}
+
+        nickname_col = self._find_column(lowered.values(), self.nickname_columns)
+        hours_col = self._find_column(lowered.values(), self.engine_hours_columns)
+        if not nickname_col or not hours_col:
+            return None
+
+        wanted = [nickname_col, hours_col]
+        for possible_names in (self.date_columns, self.location_columns):
+            match = self._find_column(lowered.values(), possible_names)
+            if match:
+                wanted.append(match)
+
+        return list(dict.fromkeys(
+            col for col, low in lowered.items() if low in wanted
+        ))
+
     def process_files(self, uploaded_files: List) -> pd.DataFrame:
         """Process multiple uploaded files and return combined DataFrame"""
-        
+
+        payloads = [(file.name, file.getvalue()) for file in uploaded_files]
+
+        # Parse files concurrently: the pandas/pyarrow/openpyxl readers
+        # release the GIL, so multi-file drops overlap I/O and parsing.
+        # Standardization and status messages stay on the main thread.
+        def _read_one(payload):
+            filename, file_bytes = payload
+            file_extension = filename.split('.')[-1].lower()
+            if file_extension not in ('csv', 'xlsx', 'xls'):
+                return None
+            try:
+                return _read_file_bytes(file_bytes, file_extension)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(8, max(1, len(payloads)))) as executor:
+            raw_frames = list(executor.map(_read_one, payloads))
+
         all_data = []
-        
-        for file in uploaded_files:
+
+        for (filename, _), raw in zip(payloads, raw_frames):
+            if raw is None:
+                st.warning(f"Unsupported file format: {filename}")
+                continue
+            if isinstance(raw, Exception):
+                st.error(f"❌ Error processing {filename}: {str(raw)}")
+                continue
+
             try:
-                # Read the file based on its extension
-                file_extension = file.name.split('.')[-1].lower()
-                
-                if file_extension == 'csv':
-                    df = pd.read_csv(file)
-                elif file_extension in ['xlsx', 'xls']:
-                    df = pd.read_excel(file)
-                else:
-                    st.warning(f"Unsupported file format: {file.name}")
-                    continue
-                
                 # Process the DataFrame
-                processed_df = self._process_dataframe(df, file.name)
-                
+                processed_df = self._process_dataframe(raw, filename)
+
                 if not processed_df.empty:
                     all_data.append(processed_df)
-                    st.success(f"✅ Successfully processed: {file.name}")
+                    st.success(f"✅ Successfully processed: {filename}")
                 else:
-                    st.warning(f"⚠️ No valid data found in: {file.name}")
-                
+                    st.warning(f"⚠️ No valid data found in: {filename}")
+
             except Exception as e:
-                st.error(f"❌ Error processing {file.name}: {str(e)}")
-        
+                st.error(f"❌ Error processing {filename}: {str(e)}")
+
         if all_data:
             combined_df = pd.concat(all_data, ignore_index=True)
             return combined_df
@@ -52,9 +134,9 @@ class DataProcessor:
     def _process_dataframe(self, df: pd.DataFrame, filename: str) -> pd.DataFrame:
         """Process individual DataFrame to standardize column names"""
         
-        # Make column names lowercase for easier matching
-        df_lower = df.copy()
-        df_lower.columns = df_lower.columns.str.lower().str.strip()
+        # Make column names lowercase for easier matching; rename only swaps
+        # the column Index, sharing the data blocks instead of copying them
+        df_lower = df.rename(columns=lambda c: str(c).strip().lower())
         
         # Find nickname column
         nickname_col = self._find_column(df_lower.columns, self.nickname_columns)
@@ -75,42 +157,57 @@ class DataProcessor:
             'source_file': filename
         })
         
-        # Add hours to 900 column
-        processed_df['hours_to_900'] = 900 - processed_df['engine_hours']
-        processed_df['hours_to_900'] = processed_df['hours_to_900'].apply(
-            lambda x: max(0, x) if pd.notna(x) else 0
+        # Add hours to 900 column (vectorized: one NumPy pass instead of a
+        # Python lambda per row)
+        processed_df['hours_to_900'] = (
+            (900 - processed_df['engine_hours']).clip(lower=0).fillna(0)
         )
         
         # Add additional columns if they exist
-        date_columns = ['date', 'timestamp', 'created_date', 'last_updated']
-        date_col = self._find_column(df_lower.columns, date_columns)
+        date_col = self._find_column(df_lower.columns, self.date_columns)
         if date_col:
             processed_df['date'] = pd.to_datetime(df_lower[date_col], errors='coerce')
-        
-        location_columns = ['location', 'field', 'site', 'area']
-        location_col = self._find_column(df_lower.columns, location_columns)
+
+        location_col = self._find_column(df_lower.columns, self.location_columns)
         if location_col:
             processed_df['location'] = df_lower[location_col]
         
         # Remove rows with invalid engine hours
         processed_df = processed_df.dropna(subset=['engine_hours'])
         processed_df = processed_df[processed_df['engine_hours'] >= 0]
-        
+
+        # Compact dtypes: float32 halves numeric bandwidth and categories
+        # store repeated strings as small integer codes
+        processed_df = processed_df.astype({
+            'engine_hours': 'float32',
+            'hours_to_900': 'float32',
+            'nickname': 'category',
+            'source_file': 'category'
+        })
+        if 'location' in processed_df.columns:
+            processed_df['location'] = processed_df['location'].astype('category')
+
         return processed_df
     
     def _find_column(self, columns, possible_names: List[str]) -> Optional[str]:
         """Find the best matching column name"""
         column_list = list(columns)
+        name_set, name_re = _column_matchers(tuple(possible_names))
+
+        # Exact matches resolve via hashed set lookup
         for col in column_list:
-            if col in possible_names:
+            if col in name_set:
                 return col
-        
-        # Try partial matching
+
+        # Partial matching: one compiled alternation instead of a nested
+        # substring scan, plus the reverse containment check
         for col in column_list:
+            if name_re.search(col):
+                return col
             for name in possible_names:
-                if name in col or col in name:
+                if col in name:
                     return col
-        
+
         return None
     
     def get_data_summary(self, df: pd.DataFrame) -> dict:
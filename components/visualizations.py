@@ -1,160 +1,403 @@
+import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
-class Visualizations:
-    """Creates various visualizations for tractor engine hours data"""
-    
-    def __init__(self):
-        self.color_palette = px.colors.qualitative.Set3
-    
-    def create_bar_chart(self, df: pd.DataFrame) -> go.Figure:
-        """Create a bar chart of engine hours by tractor nickname"""
-        
-        # Sort by engine hours for better visualization
-        df_sorted = df.sort_values('engine_hours', ascending=True)
-        
-        fig = px.bar(
-            df_sorted,
-            x='engine_hours',
-            y='nickname',
-            orientation='h',
-            title='Engine Hours by Tractor',
-            labels={'engine_hours': 'Engine Hours', 'nickname': 'Tractor Nickname'},
-            color='engine_hours',
-            color_continuous_scale='Viridis'
+# Hash DataFrames by content so identical data hits the figure cache
+_DF_HASH_FUNCS = {
+    pd.DataFrame: lambda d: pd.util.hash_pandas_object(d, index=False).values.tobytes()
+}
+
+# Caps on points shipped to the browser; larger inputs are downsampled with
+# LTTB before plotting
+_LINE_CHART_MAX_POINTS = 2000
+_SCATTER_MAX_POINTS = 5000
+
+# Built once at import and reused across builders instead of re-creating the
+# identical dict literals on every call
+_COLOR_SCALE = 'Viridis'
+_OVERLAY_MARKER = dict(color='red', size=4, opacity=0.6)
+_BASE_LAYOUT_500 = dict(height=500)
+
+def _lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: pick indices of a visually faithful
+    n_out-point subset of the series (first and last points always kept)"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('int64')
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # The next bucket's centroid anchors the triangle's right corner
+        next_hi = edges[i + 2] if i + 2 <= n_out - 2 else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+
+        # Keep the bucket point spanning the largest triangle area
+        bucket_x = x[lo:hi]
+        bucket_y = y[lo:hi]
+        areas = np.abs(
+            (x[prev] - avg_x) * (bucket_y - y[prev])
+            - (x[prev] - bucket_x) * (avg_y - y[prev])
         )
-        
-        fig.update_layout(
-            height=max(400, len(df) * 25),
-            showlegend=False,
-            xaxis_title="Engine Hours",
-            yaxis_title="Tractor Nickname"
+        prev = lo + int(areas.argmax())
+        out[i + 1] = prev
+
+    return out
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedData:
+    """Column-stored arrays shared by the figure builders (AoS-to-SoA):
+    charts read these views instead of re-extracting and re-sorting the
+    DataFrame per figure"""
+    hours: np.ndarray
+    nicknames: np.ndarray
+    order_by_hours: np.ndarray
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _prepare(df: pd.DataFrame) -> PreparedData:
+    """Extract the compact column arrays once per distinct dataset"""
+    hours = df['engine_hours'].to_numpy(dtype=np.float32)
+    return PreparedData(
+        hours=hours,
+        nicknames=df['nickname'].to_numpy(),
+        order_by_hours=np.argsort(hours, kind='stable')
+    )
+
+def _compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast engine_hours to float32 — halves the bytes serialized into
+    the figure JSON with no visible precision loss for engine hours"""
+    return df.assign(engine_hours=df['engine_hours'].astype('float32'))
+
+def _make_bar_chart(df: pd.DataFrame) -> go.Figure:
+    """Create a bar chart of engine hours by tractor nickname"""
+
+    # Shared prepared arrays: the hours sort is computed once per dataset
+    # and reused by every chart that wants hours order
+    prepared = _prepare(df)
+    order = prepared.order_by_hours
+
+    # go.Bar skips px's internal frame construction and grouping entirely
+    fig = go.Figure(
+        go.Bar(
+            x=prepared.hours[order],
+            y=prepared.nicknames[order],
+            orientation='h',
+            marker=dict(
+                color=prepared.hours[order],
+                colorscale=_COLOR_SCALE,
+                colorbar=dict(title='Engine Hours')
+            )
         )
-        
-        return fig
+    )
+
+    fig.update_layout(
+        title='Engine Hours by Tractor',
+        height=max(400, len(df) * 25),
+        showlegend=False,
+        xaxis_title="Engine Hours",
+        yaxis_title="Tractor Nickname"
+    )
     
-    def create_scatter_plot(self, df: pd.DataFrame) -> go.Figure:
-        """Create a scatter plot of engine hours distribution"""
-        
-        # Create index for x-axis if no date column
-        df_plot = df.copy()
-        df_plot['index'] = range(len(df_plot))
-        
-        fig = px.scatter(
-            df_plot,
-            x='index',
-            y='engine_hours',
-            color='nickname',
-            title='Engine Hours Distribution',
-            labels={'index': 'Tractor Index', 'engine_hours': 'Engine Hours'},
-            hover_data=['nickname', 'engine_hours']
+    return fig
+
+def _make_scatter_plot(df: pd.DataFrame) -> go.Figure:
+    """Create a scatter plot of engine hours distribution"""
+    df = _compact_frame(df)
+
+    # Synthetic x-axis handed to plotly directly — no frame copy just to
+    # attach an index column
+    index = np.arange(len(df))
+
+    # Even with WebGL, shipping every marker dominates payload and render
+    # time on huge fleets; keep a visually faithful subset
+    if len(df) > _SCATTER_MAX_POINTS:
+        keep = _lttb_downsample(
+            index,
+            df['engine_hours'].to_numpy(),
+            _SCATTER_MAX_POINTS
         )
-        
-        if 'source_file' in df.columns:
-            fig.update_traces(
-                hovertemplate='<b>%{customdata[0]}</b><br>' +
-                              'Engine Hours: %{y}<br>' +
-                              '<extra></extra>'
-            )
-        
-        fig.update_layout(
-            height=500,
-            xaxis_title="Tractor Index",
-            yaxis_title="Engine Hours"
+        df = df.iloc[keep]
+        index = index[keep]
+
+    fig = px.scatter(
+        df,
+        x=index,
+        y='engine_hours',
+        color='nickname',
+        title='Engine Hours Distribution',
+        labels={'x': 'Tractor Index', 'engine_hours': 'Engine Hours'},
+        hover_data=['nickname', 'engine_hours'],
+        render_mode='webgl'
+    )
+    
+    if 'source_file' in df.columns:
+        fig.update_traces(
+            hovertemplate='<b>%{customdata[0]}</b><br>' +
+                          'Engine Hours: %{y}<br>' +
+                          '<extra></extra>'
         )
-        
-        return fig
     
-    def create_line_chart(self, df: pd.DataFrame) -> Optional[go.Figure]:
-        """Create a line chart showing engine hours over time"""
-        
-        if 'date' not in df.columns:
-            return None
-        
-        # Sort by date
-        df_sorted = df.sort_values('date')
-        
-        fig = px.line(
-            df_sorted,
-            x='date',
-            y='engine_hours',
-            color='nickname',
-            title='Engine Hours Over Time',
-            labels={'date': 'Date', 'engine_hours': 'Engine Hours'},
-            markers=True
+    fig.update_layout(
+        **_BASE_LAYOUT_500,
+        xaxis_title="Tractor Index",
+        yaxis_title="Engine Hours"
+    )
+    
+    return fig
+
+def _make_line_chart(df: pd.DataFrame) -> Optional[go.Figure]:
+    """Create a line chart showing engine hours over time"""
+    df = _compact_frame(df)
+
+    if 'date' not in df.columns:
+        return None
+    
+    # Sort by date
+    df_sorted = df.sort_values('date')
+
+    # Downsample dense fleets so payload size and canvas render time stay
+    # bounded regardless of how many rows were logged
+    if len(df_sorted) > _LINE_CHART_MAX_POINTS:
+        per_series = max(
+            3, _LINE_CHART_MAX_POINTS // max(1, df_sorted['nickname'].nunique())
         )
-        
-        fig.update_layout(
-            height=500,
-            xaxis_title="Date",
-            yaxis_title="Engine Hours"
+        parts = []
+        for _, group in df_sorted.groupby('nickname', sort=False, observed=True):
+            keep = _lttb_downsample(
+                group['date'].to_numpy(),
+                group['engine_hours'].to_numpy(),
+                per_series
+            )
+            parts.append(group.iloc[keep])
+        df_sorted = pd.concat(parts).sort_values('date')
+
+    # One go.Scatter per nickname, fed column arrays directly — same traces
+    # px.line would emit, without its intermediate frame processing
+    fig = go.Figure()
+    for nickname, group in df_sorted.groupby('nickname', sort=False, observed=True):
+        fig.add_trace(
+            go.Scatter(
+                x=group['date'].to_numpy(),
+                y=group['engine_hours'].to_numpy(),
+                mode='lines+markers',
+                name=str(nickname)
+            )
         )
-        
-        return fig
+
+    fig.update_layout(
+        **_BASE_LAYOUT_500,
+        title='Engine Hours Over Time',
+        xaxis_title="Date",
+        yaxis_title="Engine Hours",
+        legend_title_text='nickname'
+    )
     
-    def create_box_plot(self, df: pd.DataFrame) -> go.Figure:
-        """Create a box plot for engine hours distribution analysis"""
-        
-        fig = px.box(
-            df,
-            y='engine_hours',
-            title='Engine Hours Distribution Analysis',
-            labels={'engine_hours': 'Engine Hours'}
-        )
-        
-        # Add individual points
+    return fig
+
+def _make_box_plot(df: pd.DataFrame) -> go.Figure:
+    """Create a box plot for engine hours distribution analysis"""
+    prepared = _prepare(df)
+
+    fig = px.box(
+        y=prepared.hours,
+        title='Engine Hours Distribution Analysis',
+        labels={'y': 'Engine Hours'}
+    )
+
+    # Add individual points from preextracted arrays (one read of each
+    # column, a compact int8 x vector instead of a Python list of ints).
+    # Past a few hundred tractors the overlay is unreadable anyway and the
+    # box already conveys the distribution, so skip it.
+    if len(df) <= 500:
         fig.add_trace(
             go.Scatter(
-                x=[0] * len(df),
-                y=df['engine_hours'],
+                x=np.zeros(len(df), dtype=np.int8),
+                y=prepared.hours,
                 mode='markers',
-                marker=dict(color='red', size=4, opacity=0.6),
-                text=df['nickname'],
+                marker=_OVERLAY_MARKER,
+                text=prepared.nicknames,
                 hovertemplate='<b>%{text}</b><br>Engine Hours: %{y}<extra></extra>',
                 name='Individual Tractors'
             )
         )
-        
-        fig.update_layout(
-            height=500,
-            showlegend=True,
-            yaxis_title="Engine Hours"
-        )
-        
-        return fig
     
+    fig.update_layout(
+        **_BASE_LAYOUT_500,
+        showlegend=True,
+        yaxis_title="Engine Hours"
+    )
+    
+    return fig
+
+def _make_histogram(df: pd.DataFrame) -> go.Figure:
+    """Create a histogram of engine hours distribution"""
+    prepared = _prepare(df)
+
+    fig = go.Figure(go.Histogram(x=prepared.hours, nbinsx=20))
+
+    fig.update_layout(
+        title='Engine Hours Distribution Histogram',
+        height=400,
+        xaxis_title="Engine Hours",
+        yaxis_title="Number of Tractors"
+    )
+    
+    return fig
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _bar_chart_json(df: pd.DataFrame) -> str:
+    """Build and serialize the bar chart; caching the JSON means
+    repeat renders skip both figure construction and serialization"""
+    fig = _make_bar_chart(df)
+    return fig.to_json()
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _scatter_plot_json(df: pd.DataFrame) -> str:
+    """Build and serialize the scatter plot; caching the JSON means
+    repeat renders skip both figure construction and serialization"""
+    fig = _make_scatter_plot(df)
+    return fig.to_json()
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _line_chart_json(df: pd.DataFrame) -> Optional[str]:
+    """Build and serialize the line chart; caching the JSON means
+    repeat renders skip both figure construction and serialization"""
+    fig = _make_line_chart(df)
+    if fig is None:
+        return None
+    return fig.to_json()
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _box_plot_json(df: pd.DataFrame) -> str:
+    """Build and serialize the box plot; caching the JSON means
+    repeat renders skip both figure construction and serialization"""
+    fig = _make_box_plot(df)
+    return fig.to_json()
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _histogram_json(df: pd.DataFrame) -> str:
+    """Build and serialize the histogram; caching the JSON means
+    repeat renders skip both figure construction and serialization"""
+    fig = _make_histogram(df)
+    return fig.to_json()
+
+class _HashedArray:
+    """Wrap an ndarray so lru_cache can key on its content digest"""
+    __slots__ = ('array', '_digest')
+
+    def __init__(self, array: np.ndarray, digest: bytes):
+        self.array = array
+        self._digest = digest
+
+    def __hash__(self):
+        return hash(self._digest)
+
+    def __eq__(self, other):
+        return isinstance(other, _HashedArray) and self._digest == other._digest
+
+@lru_cache(maxsize=64)
+def _summary_metrics_cached(hashed: _HashedArray) -> tuple:
+    """Reductions over the engine-hours array; an unchanged array (same
+    SHA-1 digest) skips the recomputation entirely"""
+    arr = hashed.array
+    return (
+        len(arr),
+        float(np.nanmean(arr)),
+        float(np.nanmedian(arr)),
+        float(np.nanmax(arr)),
+        float(np.nanmin(arr)),
+        float(np.nanstd(arr, ddof=1))
+    )
+
+class Visualizations:
+    """Creates various visualizations for tractor engine hours data"""
+    
+    def __init__(self):
+        self.color_palette = px.colors.qualitative.Set3
+
+    def prepare(self, df: pd.DataFrame) -> PreparedData:
+        """Column-stored arrays for this dataset, shared across charts"""
+        return _prepare(df)
+
+    def create_bar_chart(self, df: pd.DataFrame) -> go.Figure:
+        """Create a bar chart of engine hours by tractor nickname"""
+        return go.Figure(json.loads(_bar_chart_json(df)))
+
+    def create_bar_chart_json(self, df: pd.DataFrame) -> str:
+        """Pre-serialized bar chart, ready to return from a server response"""
+        return _bar_chart_json(df)
+
+    def create_scatter_plot(self, df: pd.DataFrame) -> go.Figure:
+        """Create a scatter plot of engine hours distribution"""
+        return go.Figure(json.loads(_scatter_plot_json(df)))
+
+    def create_scatter_plot_json(self, df: pd.DataFrame) -> str:
+        """Pre-serialized scatter plot, ready to return from a server response"""
+        return _scatter_plot_json(df)
+
+    def create_line_chart(self, df: pd.DataFrame) -> Optional[go.Figure]:
+        """Create a line chart showing engine hours over time"""
+        payload = _line_chart_json(df)
+        return None if payload is None else go.Figure(json.loads(payload))
+
+    def create_line_chart_json(self, df: pd.DataFrame) -> Optional[str]:
+        """Pre-serialized line chart, ready to return from a server response"""
+        return _line_chart_json(df)
+
+    def create_box_plot(self, df: pd.DataFrame) -> go.Figure:
+        """Create a box plot for engine hours distribution analysis"""
+        return go.Figure(json.loads(_box_plot_json(df)))
+
+    def create_box_plot_json(self, df: pd.DataFrame) -> str:
+        """Pre-serialized box plot, ready to return from a server response"""
+        return _box_plot_json(df)
+
     def create_histogram(self, df: pd.DataFrame) -> go.Figure:
         """Create a histogram of engine hours distribution"""
-        
-        fig = px.histogram(
-            df,
-            x='engine_hours',
-            nbins=20,
-            title='Engine Hours Distribution Histogram',
-            labels={'engine_hours': 'Engine Hours', 'count': 'Number of Tractors'}
-        )
-        
-        fig.update_layout(
-            height=400,
-            xaxis_title="Engine Hours",
-            yaxis_title="Number of Tractors"
-        )
-        
-        return fig
-    
+        return go.Figure(json.loads(_histogram_json(df)))
+
+    def create_histogram_json(self, df: pd.DataFrame) -> str:
+        """Pre-serialized histogram, ready to return from a server response"""
+        return _histogram_json(df)
+
     def create_summary_metrics(self, df: pd.DataFrame) -> dict:
         """Create summary metrics for the dashboard"""
-        
+
         if df.empty:
             return {}
-        
+
+        # One SHA-1 over the raw buffer keys the cache; unchanged data skips
+        # the quantile/mean/std recomputation on every rerun
+        arr = df['engine_hours'].to_numpy(dtype=np.float64)
+        digest = hashlib.sha1(arr.tobytes()).digest()
+        total, average, median, max_hours, min_hours, std = (
+            _summary_metrics_cached(_HashedArray(arr, digest))
+        )
+
         return {
-            'total_tractors': len(df),
-            'average_hours': df['engine_hours'].mean(),
-            'median_hours': df['engine_hours'].median(),
-            'max_hours': df['engine_hours'].max(),
-            'min_hours': df['engine_hours'].min(),
-            'std_hours': df['engine_hours'].std()
+            'total_tractors': total,
+            'average_hours': average,
+            'median_hours': median,
+            'max_hours': max_hours,
+            'min_hours': min_hours,
+            'std_hours': std
         }
\ No newline at end of file
@@ -4,6 +4,7 @@ setup(
     name="agtegra-tractors-hours",
     version="1.0.0",
     packages=find_packages(),
+    py_modules=["app", "app_flask", "app_single", "wsgi"],
     install_requires=[
         "streamlit>=1.28.0",
         "pandas>=2.0.0",
@@ -11,7 +12,15 @@ setup(
         "matplotlib>=3.7.0",
         "seaborn>=0.12.0",
         "numpy>=1.24.0",
+        "pyarrow>=14.0.0",
         "openpyxl>=3.1.0",
+        "python-calamine>=0.2.0",
+        "xlsxwriter>=3.1.0",
         "xlrd>=2.0.0"
     ],
-)
\ No newline at end of file
+    entry_points={
+        "console_scripts": [
+            "agtegra-wsgi = wsgi:main"
+        ]
+    },
+)
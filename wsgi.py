@@ -1,20 +1,19 @@
 #!/usr/bin/env python3
 """
 WSGI application for Hostinger deployment
-"""
-
-import sys
-import os
 
-# Add the project directory to Python path
-project_home = os.path.dirname(__file__)
-if project_home not in sys.path:
-    sys.path.insert(0, project_home)
+Deploy with `gunicorn --preload -w 4 wsgi:application` so forked workers
+share the already-loaded bytecode pages.
+"""
 
 from app_flask import app
 
 # WSGI application
 application = app
 
+def main():
+    """Run the development server (the agtegra-wsgi console script)"""
+    app.run(debug=False)
+
 if __name__ == "__main__":
-    app.run(debug=False)
\ No newline at end of file
+    main()